@@ -11,47 +11,134 @@ Enhanced Feedback UI for Interactive Feedback MCP
 
 import sys
 import os
-import json
 import argparse
+import logging
+import threading
+from functools import lru_cache
+from typing import Optional
 
 # 强制设置UTF-8编码
 import locale
-import codecs
+
+# 添加项目根目录到Python路径（必须位于最前面，避免被当前工作目录下同名的ui包遮蔽）
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if not sys.path or sys.path[0] != _PROJECT_ROOT:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 # 导入日志系统
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from ui.utils.logging_system import init_logging, get_logger, log_project_context, log_performance
+from ui.utils.json_io import write_json
 
-# 设置默认编码
-if sys.platform.startswith('win'):
-    # Windows系统特殊处理
+def _ensure_utf8_stream(stream):
+    """将标准流切换为UTF-8（已是UTF-8时不做任何处理）"""
+    encoding = (getattr(stream, 'encoding', None) or '').lower().replace('-', '')
+    if encoding == 'utf8':
+        return
     try:
-        # 检查是否在Windows系统上
-        if sys.platform.startswith('win'):
-            # 尝试设置stdout和stderr的UTF-8编码
-            if hasattr(sys.stdout, 'detach'):
-                sys.stdout = codecs.getwriter('utf-8')(sys.stdout.detach())  # type: ignore
-            if hasattr(sys.stderr, 'detach'):
-                sys.stderr = codecs.getwriter('utf-8')(sys.stderr.detach())  # type: ignore
-    except (AttributeError, OSError, TypeError):
-        # 如果detach()不可用或失败，跳过编码设置
+        # 原地重新配置TextIOWrapper，避免额外的codecs包装层
+        stream.reconfigure(encoding='utf-8')
+    except (AttributeError, ValueError, OSError):
+        # 非TextIOWrapper或已有未刷新的数据时跳过编码设置
         pass
 
-# 设置locale
-try:
-    locale.setlocale(locale.LC_ALL, 'zh_CN.UTF-8')
-except:
+# 设置默认编码（Windows系统特殊处理）
+if sys.platform.startswith('win'):
+    _ensure_utf8_stream(sys.stdout)
+    _ensure_utf8_stream(sys.stderr)
+
+def _setup_locale():
+    """设置locale（当前字符集已是UTF-8时无需再调用libc切换）"""
+    current = locale.setlocale(locale.LC_CTYPE).lower().replace('-', '')
+    if 'utf8' in current:
+        return
+    for candidate in ('zh_CN.UTF-8', 'en_US.UTF-8'):
+        try:
+            locale.setlocale(locale.LC_ALL, candidate)
+            return
+        except locale.Error:
+            continue
+
+_setup_locale()
+
+# 应用程序图标（相对项目根目录的固定位置）
+_APP_ICON_FILE = os.path.join(_PROJECT_ROOT, "ui", "resources", "icons", "app_icon.png")
+
+@lru_cache(maxsize=1)
+def _app_icon_path() -> Optional[str]:
+    """返回应用图标路径，不存在时返回None（进程内只检查一次）"""
+    return _APP_ICON_FILE if os.path.exists(_APP_ICON_FILE) else None
+
+# 中文字体候选（按优先级），选中结果缓存在QSettings中
+_CHINESE_FONT_FAMILIES = ('PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', 'SimHei', 'STHeiti')
+_CHINESE_FONT_SETTINGS_KEY = "fonts/chosen_chinese_family"
+
+def _select_chinese_font(app):
+    """选择可用的中文字体；命中缓存且字体仍已安装时跳过逐个匹配"""
+    from PySide6.QtCore import QSettings
+    from PySide6.QtGui import QFont, QFontDatabase
+
+    settings = QSettings()
+    cached_family = settings.value(_CHINESE_FONT_SETTINGS_KEY)
+    if cached_family and QFontDatabase.hasFamily(cached_family):
+        return QFont(cached_family)
+
+    for font_name in _CHINESE_FONT_FAMILIES:
+        test_font = QFont(font_name)
+        if test_font.exactMatch():
+            settings.setValue(_CHINESE_FONT_SETTINGS_KEY, font_name)
+            return test_font
+    return app.font()
+
+def _start_caller_detection(logger):
+    """在后台线程中检测调用方项目（git子进程与Qt初始化并行），返回线程与结果字典"""
     try:
-        locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
-    except:
-        pass
+        # 在主线程导入server.py中的检测函数：与Qt导入并发执行模块导入可能拿到未初始化完的模块
+        from server import _detect_caller_project_context, _get_caller_git_info
+    except Exception as e:
+        logger.error(f"调用方项目检测失败: {e}")
+        logger.info("将使用当前工作目录作为项目信息")
+        return None
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    result = {}
+
+    def _detect():
+        try:
+            result['context'] = _detect_caller_project_context()
+            result['git'] = _get_caller_git_info(result['context']['cwd'])
+        except Exception as e:
+            logger.error(f"调用方项目检测失败: {e}")
+            logger.info("将使用当前工作目录作为项目信息")
+
+    thread = threading.Thread(target=_detect, name="caller-detection", daemon=True)
+    thread.start()
+    return thread, result
+
+def _apply_caller_detection(thread, result, logger):
+    """等待后台检测完成，并在主线程中写入环境变量供UI组件读取"""
+    thread.join()
+    if 'git' not in result:
+        return
+    caller_context = result['context']
+    caller_git_info = result['git']
+
+    # 设置环境变量，以便UI组件能够正确读取
+    os.environ.update({
+        'MCP_CALLER_CWD': caller_context['cwd'],
+        'MCP_CALLER_PROJECT_NAME': caller_context['name'],
+        'MCP_CALLER_IS_DETECTED': str(caller_context['is_detected']),
+        'MCP_CALLER_GIT_BRANCH': caller_git_info['branch'],
+        'MCP_CALLER_GIT_MODIFIED_FILES': str(caller_git_info['modified_files']),
+        'MCP_CALLER_GIT_LAST_COMMIT': caller_git_info['last_commit'],
+        'MCP_CALLER_IS_GIT_REPO': str(caller_git_info['is_git_repo']),
+    })
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from ui.components.three_column_layout import ThreeColumnFeedbackUI
+    logger.info(f"已检测到调用方项目: {caller_context['name']} ({caller_context['cwd']})")
+
+    # 记录项目上下文
+    log_project_context("ui_startup_project_detection", {
+        'project': caller_context,
+        'git': caller_git_info
+    })
 
 def main():
     """主函数 - 处理命令行参数并运行增强版UI"""
@@ -79,37 +166,11 @@ def main():
         args = parser.parse_args()
         logger.info(f"命令行参数解析完成: prompt长度={len(args.prompt)}")
         
-        # 如果没有从server.py传递的环境变量，则自行检测调用方项目
+        # 如果没有从server.py传递的环境变量，则在后台线程中自行检测调用方项目
+        caller_detection = None
         if not os.environ.get('MCP_CALLER_CWD'):
-            logger.info("未检测到MCP服务器传递的调用方信息，直接检测调用方项目")
-            try:
-                # 导入server.py中的检测函数
-                from server import _detect_caller_project_context, _get_caller_git_info
-                
-                # 检测调用方项目上下文
-                caller_context = _detect_caller_project_context()
-                caller_git_info = _get_caller_git_info(caller_context['cwd'])
-                
-                # 设置环境变量，以便UI组件能够正确读取
-                os.environ['MCP_CALLER_CWD'] = caller_context['cwd']
-                os.environ['MCP_CALLER_PROJECT_NAME'] = caller_context['name']
-                os.environ['MCP_CALLER_IS_DETECTED'] = str(caller_context['is_detected'])
-                os.environ['MCP_CALLER_GIT_BRANCH'] = caller_git_info['branch']
-                os.environ['MCP_CALLER_GIT_MODIFIED_FILES'] = str(caller_git_info['modified_files'])
-                os.environ['MCP_CALLER_GIT_LAST_COMMIT'] = caller_git_info['last_commit']
-                os.environ['MCP_CALLER_IS_GIT_REPO'] = str(caller_git_info['is_git_repo'])
-                
-                logger.info(f"已检测到调用方项目: {caller_context['name']} ({caller_context['cwd']})")
-                
-                # 记录项目上下文
-                log_project_context("ui_startup_project_detection", {
-                    'project': caller_context,
-                    'git': caller_git_info
-                })
-                
-            except Exception as e:
-                logger.error(f"调用方项目检测失败: {e}")
-                logger.info("将使用当前工作目录作为项目信息")
+            logger.info("未检测到MCP服务器传递的调用方信息，后台检测调用方项目")
+            caller_detection = _start_caller_detection(logger)
         else:
             project_name = os.environ.get('MCP_CALLER_PROJECT_NAME')
             logger.info(f"使用MCP服务器传递的调用方信息: {project_name}")
@@ -123,103 +184,50 @@ def main():
                 'category': os.environ.get('MCP_FEEDBACK_CATEGORY')
             })
     
-    # 创建应用程序
-    app = QApplication(sys.argv)
+        # 参数合法后再加载Qt与界面组件（--help 或参数错误时无需付出导入开销）
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtGui import QPalette
+        from ui.components.three_column_layout import ThreeColumnFeedbackUI
+        from ui.styles.dark_theme import DarkThemeStyles
+        from ui.resources.icon_manager import icon_manager
     
-    # 强制设置Qt应用程序编码（PySide6中QTextCodec已弃用）
-    try:
-        # PySide6中不再需要QTextCodec，默认就是UTF-8
-        pass
-    except:
-        pass
+    # 缩放环境变量只在QApplication构造前生效，需提前一次性设置（Qt6始终启用高DPI，无需再设置AA_*属性）
+    os.environ['QT_AUTO_SCREEN_SCALE_FACTOR'] = '0'  # 防止系统缩放影响
+    os.environ['QT_SCALE_FACTOR'] = '1'  # 固定缩放比例
+    
+    # 创建应用程序（已有实例时直接复用，例如被测试或其他入口重复调用）
+    app = QApplication.instance() or QApplication(sys.argv)
     
     # 先设置临时应用程序名称，稍后会更新
     app.setApplicationName("Interactive Feedback MCP")
     app.setApplicationVersion("2.0.0")
     
-    # 设置应用程序图标（用于Dock显示）
-    from PySide6.QtGui import QIcon
-    icon_path = os.path.join(os.path.dirname(__file__), "ui", "resources", "icons", "app_icon.png")
-    if os.path.exists(icon_path):
-        app.setWindowIcon(QIcon(icon_path))
-        print(f"✅ 应用程序图标已设置: {icon_path}")
+    # 设置应用程序图标（用于Dock显示；复用icon_manager缓存的多尺寸图标，主窗口共享同一个QIcon）
+    icon_path = _app_icon_path()
+    if icon_path:
+        app.setWindowIcon(icon_manager.get_app_icon())
+        logger.debug("应用程序图标已设置: %s", icon_path)
     else:
-        print(f"⚠️ 应用程序图标文件不存在: {icon_path}")
-    
-    # 设置应用程序属性
-    app.setAttribute(Qt.AA_EnableHighDpiScaling, True)  # type: ignore
-    app.setAttribute(Qt.AA_UseHighDpiPixmaps, True)  # type: ignore
+        logger.warning("应用程序图标文件不存在: %s", _APP_ICON_FILE)
     
     # 强制设置深色模式，不受系统主题影响
     app.setStyle('Fusion')  # 使用Fusion样式避免系统主题影响
-    from PySide6.QtGui import QPalette, QColor
-    
-    # 设置强制深色调色板
-    dark_palette = QPalette()
-    dark_palette.setColor(QPalette.Window, QColor(53, 53, 53))  # type: ignore
-    dark_palette.setColor(QPalette.WindowText, QColor(255, 255, 255))  # type: ignore
-    dark_palette.setColor(QPalette.Base, QColor(25, 25, 25))  # type: ignore
-    dark_palette.setColor(QPalette.AlternateBase, QColor(53, 53, 53))  # type: ignore
-    dark_palette.setColor(QPalette.ToolTipBase, QColor(0, 0, 0))  # type: ignore
-    dark_palette.setColor(QPalette.ToolTipText, QColor(255, 255, 255))  # type: ignore
-    dark_palette.setColor(QPalette.Text, QColor(255, 255, 255))  # type: ignore
-    dark_palette.setColor(QPalette.Button, QColor(53, 53, 53))  # type: ignore
-    dark_palette.setColor(QPalette.ButtonText, QColor(255, 255, 255))  # type: ignore
-    dark_palette.setColor(QPalette.BrightText, QColor(255, 0, 0))  # type: ignore
-    dark_palette.setColor(QPalette.Link, QColor(42, 130, 218))  # type: ignore
-    dark_palette.setColor(QPalette.Highlight, QColor(42, 130, 218))  # type: ignore
-    dark_palette.setColor(QPalette.HighlightedText, QColor(0, 0, 0))  # type: ignore
     
-    app.setPalette(dark_palette)
+    # 设置强制深色调色板（角色颜色表在 dark_theme 中集中维护）
+    DarkThemeStyles.apply_forced_dark_palette(app)
     
     # 禁用系统主题跟随，强制保持深色模式
-    try:
-        os.environ['QT_AUTO_SCREEN_SCALE_FACTOR'] = '0'  # 防止系统缩放影响
-        os.environ['QT_SCALE_FACTOR'] = '1'  # 固定缩放比例
-        # 禁用系统主题检测
-        app.setProperty("_q_noSystemThemeChange", True)
-    except Exception as e:
-        print(f"⚠️ 设置系统主题隔离失败: {e}")
+    app.setProperty("_q_noSystemThemeChange", True)
     
-    print("🌙 强制深色模式已启用，不受系统主题影响")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("强制深色模式已启用: Window=%s", app.palette().color(QPalette.Window).name())  # type: ignore
     
     # 进一步强化深色模式设置，防止系统主题覆盖
-    try:
-        # 强制设置所有可能的深色相关属性
-        app.setProperty("_q_unifiedTitleAndToolBarOnMac", False)
-        app.setProperty("_qt_mac_wants_layer", True)
-        
-        # 禁用所有可能的系统主题检测
-        from PySide6.QtCore import QSettings
-        settings = QSettings()
-        settings.setValue("appearance/color_scheme", "dark")
-        settings.setValue("appearance/force_dark_mode", True)
-        settings.sync()
-        
-        # 验证调色板是否正确应用
-        current_palette = app.palette()
-        window_color = current_palette.color(QPalette.Window)  # type: ignore
-        if window_color.red() > 128:  # 如果仍然是浅色
-            print("⚠️ 检测到系统覆盖，重新应用深色调色板")
-            app.setPalette(dark_palette)  # 重新应用
-        
-        print(f"📊 最终Window背景色: {current_palette.color(QPalette.Window).name()}")  # type: ignore
-        print(f"📊 最终Text文字色: {current_palette.color(QPalette.WindowText).name()}")  # type: ignore
-        
-    except Exception as e:
-        print(f"⚠️ 强化深色模式设置时出现警告: {e}")
+    app.setProperty("_q_unifiedTitleAndToolBarOnMac", False)
+    app.setProperty("_qt_mac_wants_layer", True)
     
     # 设置中文字体支持
-    from PySide6.QtGui import QFont
-    default_font = QFont()
-    chinese_fonts = ['PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', 'SimHei', 'STHeiti']
-    for font_name in chinese_fonts:
-        test_font = QFont(font_name)
-        default_font.setFamily(font_name)
-        if test_font.exactMatch():
-            break
-    else:
-        default_font = app.font()
+    default_font = _select_chinese_font(app)
     
     default_font.setPointSize(14)
     app.setFont(default_font)
@@ -227,8 +235,12 @@ def main():
     # 处理预定义选项
     predefined_options = []
     if args.predefined_options:
-        predefined_options = args.predefined_options.split('|||')
-        predefined_options = [opt.strip() for opt in predefined_options if opt.strip()]
+        # 每个选项只strip一次，并丢弃空白项
+        predefined_options = list(filter(None, map(str.strip, args.predefined_options.split('|||'))))
+    
+    # UI构造时读取调用方环境变量，此处再等待后台检测结束
+    if caller_detection:
+        _apply_caller_detection(*caller_detection, logger)
     
     # 创建并显示UI
     ui = ThreeColumnFeedbackUI(args.prompt, predefined_options)
@@ -255,10 +267,10 @@ def main():
             'images': []
         }
     
-    # 将结果写入输出文件
+    # 将结果写入输出文件（完整序列化后单次写入，可用时使用orjson）
+    # 结果文件只由server读取，使用紧凑格式，避免为多MB的Base64图片额外缩进排版
     try:
-        with open(args.output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(args.output_file, result, indent=None)
         return 0
     except Exception as e:
         print(f"Error writing output file: {e}", file=sys.stderr)
@@ -12,10 +12,13 @@ import json
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
+from collections import deque
 import subprocess
 
 # 添加项目根目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from ui.utils.logging_system import (
     get_log_summary, cleanup_logs, configure_logging,
@@ -24,45 +27,46 @@ from ui.utils.logging_system import (
 
 def show_log_summary():
     """显示日志摘要"""
-    print("📊 Interactive Feedback MCP - 日志系统摘要")
-    print("=" * 60)
+    lines = ["📊 Interactive Feedback MCP - 日志系统摘要", "=" * 60]
     
     try:
         summary = get_log_summary()
         
-        print(f"📁 日志目录: {summary['log_directory']}")
-        print(f"🔢 总错误数: {summary['total_errors']}")
-        print(f"⚠️  总警告数: {summary['total_warnings']}")
-        print()
+        lines.append(f"📁 日志目录: {summary['log_directory']}")
+        lines.append(f"🔢 总错误数: {summary['total_errors']}")
+        lines.append(f"⚠️  总警告数: {summary['total_warnings']}")
+        lines.append("")
         
-        print("📋 日志文件:")
+        lines.append("📋 日志文件:")
         for filename, info in summary['log_files'].items():
             if 'error' in info:
-                print(f"  ❌ {filename}: {info['error']}")
+                lines.append(f"  ❌ {filename}: {info['error']}")
             else:
-                print(f"  📄 {filename}:")
-                print(f"     大小: {info['size_mb']:.2f} MB ({info['size']} bytes)")
-                print(f"     行数: {info['lines']}")
-                print(f"     修改时间: {info['modified']}")
+                lines.append(f"  📄 {filename}:")
+                lines.append(f"     大小: {info['size_mb']:.2f} MB ({info['size']} bytes)")
+                lines.append(f"     行数: {info['lines']}")
+                lines.append(f"     修改时间: {info['modified']}")
         
-        print()
+        lines.append("")
         
         # 性能统计
         perf_stats = summary.get('performance_stats', {})
         if perf_stats:
-            print("⚡ 性能统计:")
-            print(f"  总操作数: {perf_stats['total_operations']}")
-            print(f"  平均耗时: {perf_stats['avg_duration']:.3f}s")
-            print(f"  最大耗时: {perf_stats['max_duration']:.3f}s")
-            print(f"  慢操作数: {perf_stats['slow_operations']}")
+            lines.append("⚡ 性能统计:")
+            lines.append(f"  总操作数: {perf_stats['total_operations']}")
+            lines.append(f"  平均耗时: {perf_stats['avg_duration']:.3f}s")
+            lines.append(f"  最大耗时: {perf_stats['max_duration']:.3f}s")
+            lines.append(f"  慢操作数: {perf_stats['slow_operations']}")
             
             if perf_stats.get('operations_breakdown'):
-                print("  操作分解:")
+                lines.append("  操作分解:")
                 for op, stats in perf_stats['operations_breakdown'].items():
-                    print(f"    {op}: {stats['count']}次, 平均{stats['avg_duration']:.3f}s")
+                    lines.append(f"    {op}: {stats['count']}次, 平均{stats['avg_duration']:.3f}s")
         
     except Exception as e:
-        print(f"❌ 获取日志摘要失败: {e}")
+        lines.append(f"❌ 获取日志摘要失败: {e}")
+    
+    print("\n".join(lines))
 
 def cleanup_old_logs(days: int = 30):
     """清理旧日志"""
@@ -103,10 +107,9 @@ def view_recent_logs(log_type: str = "main", lines: int = 50):
         if sys.platform.startswith('win'):
             # Windows没有tail命令，使用Python实现
             with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                for line in recent_lines:
-                    print(line.rstrip())
+                recent_lines = deque(f, maxlen=lines)
+            sys.stdout.writelines(recent_lines)
+            sys.stdout.flush()
         else:
             # Unix/Linux/macOS使用tail命令
             subprocess.run(['tail', '-n', str(lines), str(log_file)])
@@ -129,36 +132,39 @@ def search_logs(pattern: str, log_type: str = "main"):
         print(f"❌ 不支持的日志类型: {log_type}")
         return
     
-    print(f"🔍 在 {log_type} 日志中搜索: {pattern}")
-    print("=" * 60)
+    lines = [f"🔍 在 {log_type} 日志中搜索: {pattern}", "=" * 60]
+    pattern_lower = pattern.lower()
     
     try:
         if log_type == "all":
             # 搜索所有日志文件
             for log_file in log_dir.glob("*.log"):
-                print(f"\n📄 {log_file.name}:")
+                lines.append(f"\n📄 {log_file.name}:")
                 with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
                     for line_num, line in enumerate(f, 1):
-                        if pattern.lower() in line.lower():
-                            print(f"  {line_num}: {line.rstrip()}")
+                        if pattern_lower in line.lower():
+                            lines.append(f"  {line_num}: {line.rstrip()}")
         else:
             log_file = log_dir / log_files[log_type]
             if not log_file.exists():
-                print(f"❌ 日志文件不存在: {log_file}")
+                lines.append(f"❌ 日志文件不存在: {log_file}")
+                print("\n".join(lines))
                 return
             
             with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
                 found = False
                 for line_num, line in enumerate(f, 1):
-                    if pattern.lower() in line.lower():
-                        print(f"{line_num}: {line.rstrip()}")
+                    if pattern_lower in line.lower():
+                        lines.append(f"{line_num}: {line.rstrip()}")
                         found = True
                 
                 if not found:
-                    print("❌ 未找到匹配的日志条目")
+                    lines.append("❌ 未找到匹配的日志条目")
                     
     except Exception as e:
-        print(f"❌ 搜索日志失败: {e}")
+        lines.append(f"❌ 搜索日志失败: {e}")
+    
+    print("\n".join(lines))
 
 def analyze_errors():
     """分析错误日志"""
@@ -169,8 +175,7 @@ def analyze_errors():
         print("❌ 错误日志文件不存在")
         return
     
-    print("🔍 错误日志分析")
-    print("=" * 60)
+    lines = ["🔍 错误日志分析", "=" * 60]
     
     try:
         error_types = {}
@@ -192,13 +197,17 @@ def analyze_errors():
                     except:
                         error_types['未分类错误'] = error_types.get('未分类错误', 0) + 1
         
-        print(f"📊 总错误数: {error_count}")
-        print("\n🏷️  错误类型分布:")
-        for error_type, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {count:3d}x {error_type}")
-            
+        lines.append(f"📊 总错误数: {error_count}")
+        lines.append("\n🏷️  错误类型分布:")
+        lines.extend(
+            f"  {count:3d}x {error_type}"
+            for error_type, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True)
+        )
+        
     except Exception as e:
-        print(f"❌ 分析错误日志失败: {e}")
+        lines.append(f"❌ 分析错误日志失败: {e}")
+    
+    print("\n".join(lines))
 
 def monitor_logs():
     """实时监控日志"""
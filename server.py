@@ -11,12 +11,20 @@ import subprocess
 import base64
 import argparse
 from datetime import datetime
+from pathlib import Path
 from typing import Annotated, Dict, Tuple, List, Optional
 
 from fastmcp import FastMCP
 from fastmcp.utilities.types import Image
 from pydantic import Field
 
+# 可选的SIMD加速Base64解码（未安装时回退到标准库）
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 # 解析命令行参数
 def parse_command_line_args():
     """解析命令行参数"""
@@ -55,8 +63,11 @@ if cmd_args.log_level:
     os.environ['MCP_FEEDBACK_LOG_LEVEL'] = cmd_args.log_level
 
 # 导入日志系统
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 from ui.utils.logging_system import init_logging, get_logger, log_performance, log_project_context
+from ui.utils.json_io import read_json
 
 # 初始化日志系统
 logging_manager = init_logging({
@@ -74,11 +85,11 @@ mcp = FastMCP("Interactive Feedback MCP")
 logger = get_logger('mcp_server')
 
 # 记录启动参数
-logger.info(f"MCP服务器启动 - 调用来源: {GLOBAL_CALLER_SOURCE}")
+logger.info("MCP服务器启动 - 调用来源: %s", GLOBAL_CALLER_SOURCE)
 if cmd_args.caller_source:
-    logger.info(f"通过命令行参数设置调用来源: {cmd_args.caller_source}")
+    logger.info("通过命令行参数设置调用来源: %s", cmd_args.caller_source)
 elif os.environ.get('MCP_FEEDBACK_CALLER_SOURCE'):
-    logger.info(f"通过环境变量设置调用来源: {os.environ.get('MCP_FEEDBACK_CALLER_SOURCE')}")
+    logger.info("通过环境变量设置调用来源: %s", os.environ.get('MCP_FEEDBACK_CALLER_SOURCE'))
 else:
     logger.info("使用默认调用来源: cursor")
 
@@ -93,7 +104,7 @@ def _detect_caller_project_context():
             env_cwd = os.environ.get('PWD')
             if env_cwd and os.path.exists(env_cwd) and _is_project_directory(env_cwd):
                 caller_cwd = env_cwd
-                logger.info(f"从PWD环境变量检测到项目: {env_cwd}")
+                logger.info("从PWD环境变量检测到项目: %s", env_cwd)
             
             # 方法2: 使用当前工作目录
             if not caller_cwd:
@@ -103,11 +114,11 @@ def _detect_caller_project_context():
                 # 如果当前目录不是MCP服务器目录，且是有效项目目录
                 if current_cwd != script_dir and _is_project_directory(current_cwd):
                     caller_cwd = current_cwd
-                    logger.info(f"从当前工作目录检测到项目: {current_cwd}")
+                    logger.info("从当前工作目录检测到项目: %s", current_cwd)
                 # 即使是同一个目录，如果是有效项目目录也使用
                 elif _is_project_directory(current_cwd):
                     caller_cwd = current_cwd
-                    logger.info(f"使用当前目录作为项目: {current_cwd}")
+                    logger.info("使用当前目录作为项目: %s", current_cwd)
             
             # 方法3: 尝试使用psutil从父进程获取
             if not caller_cwd:
@@ -119,14 +130,14 @@ def _detect_caller_project_context():
                         parent_cwd = parent_process.cwd()
                         if _is_project_directory(parent_cwd):
                             caller_cwd = parent_cwd
-                            logger.info(f"从父进程检测到项目: {parent_cwd}")
+                            logger.info("从父进程检测到项目: %s", parent_cwd)
                 except (ImportError, psutil.NoSuchProcess, psutil.AccessDenied, Exception) as e:
-                    logger.debug(f"父进程检测失败: {e}")
+                    logger.debug("父进程检测失败: %s", e)
             
             # 方法4: 回退到当前目录
             if not caller_cwd:
                 caller_cwd = os.getcwd()
-                logger.info(f"使用当前目录作为回退: {caller_cwd}")
+                logger.info("使用当前目录作为回退: %s", caller_cwd)
             
             # 获取项目基本信息
             project_name = os.path.basename(caller_cwd)
@@ -138,7 +149,7 @@ def _detect_caller_project_context():
                 'is_detected': is_detected
             }
             
-            logger.info(f"项目检测完成: 项目={project_name}, 路径={caller_cwd}, 有效={is_detected}")
+            logger.info("项目检测完成: 项目=%s, 路径=%s, 有效=%s", project_name, caller_cwd, is_detected)
             
             # 记录项目上下文
             log_project_context("project_detection", result)
@@ -146,7 +157,7 @@ def _detect_caller_project_context():
             return result
                 
         except Exception as e:
-            logger.error(f"项目检测异常: {e}")
+            logger.error("项目检测异常: %s", e)
             fallback_cwd = os.getcwd()
             result = {
                 'cwd': fallback_cwd,
@@ -162,19 +173,27 @@ def _detect_caller_project_context():
             
             return result
 
+# 常见的项目标识文件
+_PROJECT_INDICATORS = (
+    '.git', 'package.json', 'requirements.txt', 'pyproject.toml',
+    'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
+    '.gitignore', 'README.md', 'README.rst', '.cursorrules'
+)
+
+# 调用方Git信息采集命令
+_GIT_INFO_COMMANDS = (
+    (('git', 'branch', '--show-current'), 'branch'),
+    (('git', 'status', '--porcelain'), 'status'),
+    (('git', 'log', '-1', '--pretty=format:%s'), 'last_commit'),
+    (('git', 'rev-parse', '--is-inside-work-tree'), 'is_git_repo')
+)
+
 def _is_project_directory(path):
     """判断是否为项目目录"""
     if not os.path.exists(path):
         return False
     
-    # 检查常见的项目标识文件
-    project_indicators = [
-        '.git', 'package.json', 'requirements.txt', 'pyproject.toml',
-        'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
-        '.gitignore', 'README.md', 'README.rst', '.cursorrules'
-    ]
-    
-    for indicator in project_indicators:
+    for indicator in _PROJECT_INDICATORS:
         if os.path.exists(os.path.join(path, indicator)):
             return True
     
@@ -183,15 +202,8 @@ def _is_project_directory(path):
 def _get_caller_git_info(project_dir):
     """获取调用方项目的Git信息"""
     try:
-        git_commands = [
-            (['git', 'branch', '--show-current'], 'branch'),
-            (['git', 'status', '--porcelain'], 'status'),
-            (['git', 'log', '-1', '--pretty=format:%s'], 'last_commit'),
-            (['git', 'rev-parse', '--is-inside-work-tree'], 'is_git_repo')
-        ]
-        
         git_info = {}
-        for cmd, key in git_commands:
+        for cmd, key in _GIT_INFO_COMMANDS:
             try:
                 result = subprocess.run(cmd, cwd=project_dir,
                                       capture_output=True, text=True, timeout=3)
@@ -199,7 +211,7 @@ def _get_caller_git_info(project_dir):
                     git_info[key] = result.stdout.strip()
                 else:
                     git_info[key] = ""
-            except:
+            except (OSError, subprocess.SubprocessError):
                 git_info[key] = ""
         
         # 处理状态信息
@@ -212,7 +224,7 @@ def _get_caller_git_info(project_dir):
             'last_commit': git_info.get('last_commit', 'No commits') or 'No commits',
             'is_git_repo': git_info.get('is_git_repo') == 'true'
         }
-    except:
+    except Exception:
         return {
             'branch': 'unknown',
             'modified_files': 0,
@@ -220,6 +232,20 @@ def _get_caller_git_info(project_dir):
             'is_git_repo': False
         }
 
+def _b64decode(data: str) -> bytes:
+    """解码UI返回的Base64图片数据"""
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64decode(data, validate=True)
+    return base64.b64decode(data)
+
+def _image_format_from_bytes(data: bytes) -> str:
+    """根据文件头判断图片格式（UI对不透明截图使用JPEG，透明图片使用WebP或PNG）"""
+    if data.startswith(b'\xff\xd8\xff'):
+        return "jpeg"
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return "webp"
+    return "png"
+
 def launch_feedback_ui(
     summary: str, 
     predefinedOptions: list[str] | None = None,
@@ -236,7 +262,7 @@ def launch_feedback_ui(
         
         # 使用全局调用源信息（已在启动时确定优先级）
         caller_source = GLOBAL_CALLER_SOURCE
-        logger.info(f"启动反馈UI: 优先级={priority}, 类别={category}, 调用源={caller_source}")
+        logger.info("启动反馈UI: 优先级=%s, 类别=%s, 调用源=%s", priority, category, caller_source)
         
         # Create a temporary file for the feedback result
         with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
@@ -250,16 +276,12 @@ def launch_feedback_ui(
             caller_cwd = project_path or caller_context['cwd']
             effective_project_name = project_name or caller_context['name']
             
-            logger.info(f"使用项目路径: {caller_cwd}, 项目名称: {effective_project_name}")
+            logger.info("使用项目路径: %s, 项目名称: %s", caller_cwd, effective_project_name)
             
             # 获取调用方Git信息
             caller_git_info = _get_caller_git_info(caller_cwd)
             effective_git_branch = git_branch or caller_git_info['branch']
             
-            # Get the path to enhanced_feedback_ui.py relative to this script
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            feedback_ui_path = os.path.join(script_dir, "enhanced_feedback_ui.py")
-
             # 准备环境变量，传递调用方项目上下文
             env = os.environ.copy()
             env['MCP_CALLER_CWD'] = caller_cwd
@@ -282,16 +304,18 @@ def launch_feedback_ui(
             # Run feedback_ui.py as a separate process
             # NOTE: There appears to be a bug in uv, so we need
             # to pass a bunch of special flags to make this work
+            # 按脚本路径启动：sys.path[0]为脚本所在目录，不会被调用方工作目录下同名的ui包遮蔽
+            # （-m 方式会把继承的cwd放在sys.path最前面）。ui包的模块仍会复用__pycache__中的字节码
             args = [
                 sys.executable,
                 "-u",
-                feedback_ui_path,
+                os.path.join(_PROJECT_ROOT, "enhanced_feedback_ui.py"),
                 "--prompt", summary,
                 "--output-file", output_file,
                 "--predefined-options", "|||".join(predefinedOptions) if predefinedOptions else ""
             ]
             
-            logger.info(f"启动UI进程: {' '.join(args[:3])}...")
+            logger.info("启动UI进程: %s...", ' '.join(args[:3]))
             
             result = subprocess.run(
                 args,
@@ -305,23 +329,21 @@ def launch_feedback_ui(
             )
             
             if result.returncode != 0:
-                logger.error(f"UI进程异常退出，返回码: {result.returncode}")
+                logger.error("UI进程异常退出，返回码: %s", result.returncode)
                 raise Exception(f"Failed to launch feedback UI: {result.returncode}")
 
             logger.info("UI进程执行完成，读取结果文件")
             
-            # Read the result from the temporary file
-            with open(output_file, 'r', encoding='utf-8') as f:
-                ui_result = json.load(f)
-            os.unlink(output_file)
+            # Read the result from the temporary file (整块读取，可用时使用orjson解析)
+            ui_result = read_json(output_file)
+            Path(output_file).unlink(missing_ok=True)
             
-            logger.info(f"UI反馈结果: {len(ui_result.get('interactive_feedback', ''))} 字符")
+            logger.info("UI反馈结果: %d 字符", len(ui_result.get('interactive_feedback', '')))
             return ui_result
             
         except Exception as e:
-            logger.error(f"UI启动失败: {str(e)}")
-            if os.path.exists(output_file):
-                os.unlink(output_file)
+            logger.error("UI启动失败: %s", e)
+            Path(output_file).unlink(missing_ok=True)
             raise e
 
 @mcp.tool()
@@ -397,15 +419,15 @@ def interactive_feedback(
     if GLOBAL_CALLER_SOURCE == "augment" and img_b64_list:
         # Augment 调用：简化处理，只返回文本说明
         txt += f"\n\n📷 检测到 {len(img_b64_list)} 张图片（Augment调用模式）"
-        logger.info(f"Augment调用: 检测到 {len(img_b64_list)} 张图片")
+        logger.info("Augment调用: 检测到 %d 张图片", len(img_b64_list))
         return txt
     else:
         # 其他调用方式（Cursor等）：返回 Image 对象
         images: List[Image] = []
         for b64 in img_b64_list:
             try:
-                img_bytes = base64.b64decode(b64)
-                images.append(Image(data=img_bytes, format="png"))
+                img_bytes = _b64decode(b64)
+                images.append(Image(data=img_bytes, format=_image_format_from_bytes(img_bytes)))
             except Exception:
                 # 若解码失败，忽略该图片并在文字中提示
                 txt += f"\n\n[warning] 有一张图片解码失败。"
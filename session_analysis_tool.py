@@ -13,6 +13,7 @@ from typing import Dict, List, Any
 from session_metrics_collector import SessionAnalyzer
 from session_integration import get_project_report
 
+
 class SessionAnalysisTool:
     """会话分析工具"""
     
@@ -28,8 +29,7 @@ class SessionAnalysisTool:
             print("📋 没有找到任何项目记录")
             return
         
-        print("📋 已记录的项目列表:")
-        print("=" * 50)
+        lines = ["📋 已记录的项目列表:", "=" * 50]
         
         for i, project in enumerate(projects, 1):
             project_dir = self.log_dir / f"project_{project}"
@@ -37,63 +37,69 @@ class SessionAnalysisTool:
             
             if summary_file.exists():
                 # 统计会话数量
-                session_count = 0
                 with open(summary_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            session_count += 1
+                    session_count = sum(1 for line in f if line.strip())
                 
-                print(f"{i:2d}. {project} ({session_count} 会话)")
+                lines.append(f"{i:2d}. {project} ({session_count} 会话)")
             else:
-                print(f"{i:2d}. {project} (无会话记录)")
+                lines.append(f"{i:2d}. {project} (无会话记录)")
+        
+        print("\n".join(lines))
     
     def analyze_project(self, project_name: str, detailed: bool = False):
         """分析指定项目"""
-        print(f"📊 分析项目: {project_name}")
-        print("=" * 50)
+        lines = [f"📊 分析项目: {project_name}", "=" * 50]
         
         report = get_project_report(project_name)
         
         if "error" in report:
-            print(f"❌ {report['error']}")
+            lines.append(f"❌ {report['error']}")
+            print("\n".join(lines))
             return
         
         # 基础统计
-        print("📈 基础统计:")
-        print(f"  总会话数: {report['total_sessions']}")
-        print(f"  自动终止会话: {report['auto_terminated_sessions']}")
-        print(f"  自动终止率: {report['auto_termination_rate']:.1%}")
-        print(f"  平均会话时长: {report['average_duration_seconds']:.1f} 秒")
-        print(f"  平均用户消息数: {report['average_user_messages']:.1f}")
-        print(f"  平均工具调用数: {report['average_tool_calls']:.1f}")
+        lines += [
+            "📈 基础统计:",
+            f"  总会话数: {report['total_sessions']}",
+            f"  自动终止会话: {report['auto_terminated_sessions']}",
+            f"  自动终止率: {report['auto_termination_rate']:.1%}",
+            f"  平均会话时长: {report['average_duration_seconds']:.1f} 秒",
+            f"  平均用户消息数: {report['average_user_messages']:.1f}",
+            f"  平均工具调用数: {report['average_tool_calls']:.1f}",
+        ]
         
         # 风险分析
-        print("\n⚠️ 风险分析:")
-        print(f"  高风险会话: {report['high_risk_sessions']}")
-        print(f"  高风险率: {report['high_risk_rate']:.1%}")
+        lines += [
+            "\n⚠️ 风险分析:",
+            f"  高风险会话: {report['high_risk_sessions']}",
+            f"  高风险率: {report['high_risk_rate']:.1%}",
+        ]
         
         # 类别分布
-        print("\n📊 类别分布:")
+        lines.append("\n📊 类别分布:")
         categories = report['category_distribution']
         if categories:
-            for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
-                print(f"  {category}: {count}")
+            lines.extend(
+                f"  {category}: {count}"
+                for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True)
+            )
         else:
-            print("  无类别数据")
+            lines.append("  无类别数据")
         
         # 详细信息
         if detailed:
-            print("\n📋 最近会话:")
+            lines.append("\n📋 最近会话:")
             for session in report['recent_sessions']:
                 start_time = datetime.fromisoformat(session['start_time']).strftime("%m-%d %H:%M")
                 duration = session.get('duration_seconds', 0)
                 status = "🔴 自动终止" if session.get('auto_terminated', False) else "🟢 正常结束"
-                print(f"  {start_time} | {duration:.0f}s | {status} | {session.get('end_reason', 'unknown')}")
+                lines.append(f"  {start_time} | {duration:.0f}s | {status} | {session.get('end_reason', 'unknown')}")
+        
+        print("\n".join(lines))
     
     def compare_projects(self, project_names: List[str]):
         """对比多个项目"""
-        print("📊 项目对比分析")
-        print("=" * 60)
+        lines = ["📊 项目对比分析", "=" * 60]
         
         reports = {}
         for project in project_names:
@@ -102,18 +108,21 @@ class SessionAnalysisTool:
                 reports[project] = report
         
         if not reports:
-            print("❌ 没有找到有效的项目数据")
+            lines.append("❌ 没有找到有效的项目数据")
+            print("\n".join(lines))
             return
         
         # 对比表格
-        print(f"{'项目名称':<20} {'会话数':<8} {'自动终止率':<10} {'平均时长(s)':<12} {'高风险率':<10}")
-        print("-" * 60)
+        lines.append(f"{'项目名称':<20} {'会话数':<8} {'自动终止率':<10} {'平均时长(s)':<12} {'高风险率':<10}")
+        lines.append("-" * 60)
         
         for project, report in reports.items():
-            print(f"{project:<20} {report['total_sessions']:<8} "
-                  f"{report['auto_termination_rate']:.1%:<10} "
-                  f"{report['average_duration_seconds']:<12.1f} "
-                  f"{report['high_risk_rate']:.1%:<10}")
+            lines.append(f"{project:<20} {report['total_sessions']:<8} "
+                         f"{format(report['auto_termination_rate'], '.1%'):<10} "
+                         f"{report['average_duration_seconds']:<12.1f} "
+                         f"{format(report['high_risk_rate'], '.1%'):<10}")
+        
+        print("\n".join(lines))
     
     def find_problematic_patterns(self, project_name: str):
         """寻找问题模式"""
@@ -192,20 +201,20 @@ class SessionAnalysisTool:
     
     def generate_summary_report(self):
         """生成总体摘要报告"""
-        print("📊 总体摘要报告")
-        print("=" * 50)
+        lines = ["📊 总体摘要报告", "=" * 50]
         
         projects = self.analyzer.get_all_projects()
         if not projects:
-            print("❌ 没有找到任何项目数据")
+            lines.append("❌ 没有找到任何项目数据")
+            print("\n".join(lines))
             return
         
         total_sessions = 0
         total_auto_terminated = 0
         total_duration = 0
-        all_categories = []
+        unique_categories = set()
         
-        print("📋 项目概览:")
+        lines.append("📋 项目概览:")
         for project in projects:
             report = get_project_report(project)
             if "error" not in report:
@@ -216,21 +225,23 @@ class SessionAnalysisTool:
                 total_sessions += sessions
                 total_auto_terminated += auto_terminated
                 total_duration += avg_duration * sessions
-                all_categories.extend(report['category_distribution'].keys())
+                unique_categories.update(report['category_distribution'])
                 
-                print(f"  {project}: {sessions} 会话, {auto_terminated} 自动终止")
+                lines.append(f"  {project}: {sessions} 会话, {auto_terminated} 自动终止")
         
         if total_sessions > 0:
-            print(f"\n📈 总体统计:")
-            print(f"  总会话数: {total_sessions}")
-            print(f"  总自动终止数: {total_auto_terminated}")
-            print(f"  全局自动终止率: {total_auto_terminated/total_sessions:.1%}")
-            print(f"  平均会话时长: {total_duration/total_sessions:.1f} 秒")
-            
-            # 活跃类别
-            unique_categories = set(all_categories)
-            print(f"  活跃类别数: {len(unique_categories)}")
-            print(f"  类别列表: {', '.join(sorted(unique_categories))}")
+            lines += [
+                "\n📈 总体统计:",
+                f"  总会话数: {total_sessions}",
+                f"  总自动终止数: {total_auto_terminated}",
+                f"  全局自动终止率: {total_auto_terminated/total_sessions:.1%}",
+                f"  平均会话时长: {total_duration/total_sessions:.1f} 秒",
+                # 活跃类别
+                f"  活跃类别数: {len(unique_categories)}",
+                f"  类别列表: {', '.join(sorted(unique_categories))}",
+            ]
+        
+        print("\n".join(lines))
 
 def main():
     """主函数"""
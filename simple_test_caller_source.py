@@ -10,7 +10,9 @@ import argparse
 from datetime import datetime
 
 # 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 def test_caller_source_field(caller_source):
     """测试指定调用来源的字段显示"""
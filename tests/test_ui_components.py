@@ -13,7 +13,9 @@ from PySide6.QtTest import QTest
 from PySide6.QtCore import Qt
 
 # 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from ui.components.three_column_layout import ThreeColumnFeedbackUI
 
@@ -186,6 +188,178 @@ class TestThreeColumnFeedbackUI(unittest.TestCase):
         self.assertNotEqual(original_html, help_html)
         self.assertIn("快捷键帮助", help_html)
 
+class TestFeedbackTextEditImages(unittest.TestCase):
+    """输入框图片粘贴、后台编码与删除测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """测试类初始化"""
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+    
+    def setUp(self):
+        """创建输入框并固定图片编码设置（不受本机QSettings影响）"""
+        from ui.widgets.feedback_text_edit import FeedbackTextEdit, _webp_writable
+        self.edit = FeedbackTextEdit()
+        self.edit.lossless_images = False
+        self.edit.lossless_image_format = "WEBP" if _webp_writable() else "PNG"
+        self.lossless_mime = f"image/{self.edit.lossless_image_format.lower()}"
+    
+    def tearDown(self):
+        """等待编码任务结束"""
+        self.edit.clear_images()
+        self.edit.deleteLater()
+    
+    def _paste(self, color, alpha=255, size=(64, 48)):
+        """通过QMimeData粘贴一张纯色图片，返回图片ID"""
+        from PySide6.QtCore import QMimeData
+        from PySide6.QtGui import QImage, QColor
+        image = QImage(size[0], size[1], QImage.Format_ARGB32)
+        image.fill(QColor(color[0], color[1], color[2], alpha))
+        mime = QMimeData()
+        mime.setImageData(image)
+        self.edit.insertFromMimeData(mime)
+        return self.edit._image_data[-1]['id']
+    
+    def _settle(self):
+        """等待后台编码完成并处理排队回界面线程的信号"""
+        self.edit._encode_pool.waitForDone()
+        QApplication.processEvents()
+    
+    def test_opaque_and_transparent_mime_types(self):
+        """不透明图片编码为JPEG，含透明像素的图片使用无损格式"""
+        opaque_id = self._paste((10, 120, 200))
+        transparent_id = self._paste((200, 30, 30), alpha=100)
+        
+        images = {info['id']: info for info in self.edit.get_image_data()}
+        self.assertEqual(images[opaque_id]['mime_type'], "image/jpeg")
+        self.assertEqual(images[transparent_id]['mime_type'], self.lossless_mime)
+        self.assertTrue(all(images[image_id]['base64'] for image_id in (opaque_id, transparent_id)))
+    
+    def test_removed_image_is_not_submitted(self):
+        """删除的图片（包括尚未编码的）不会出现在提交数据中"""
+        removed_id = self._paste((1, 2, 3))
+        kept_id = self._paste((4, 5, 6))
+        self.assertTrue(self.edit.remove_image(removed_id))
+        
+        self.assertEqual([info['id'] for info in self.edit.get_image_data()], [kept_id])
+        self.assertEqual(len(self.edit.get_images_list()), 1)
+        self.assertFalse(self.edit.remove_image(removed_id))
+    
+    def test_duplicate_paste_is_dropped(self):
+        """重复粘贴同一张图片只保留一份，并发出image_duplicate信号"""
+        duplicates = []
+        self.edit.image_duplicate.connect(lambda image_id, existing_id: duplicates.append((image_id, existing_id)))
+        first_id = self._paste((7, 8, 9))
+        self._settle()
+        second_id = self._paste((7, 8, 9))
+        self._settle()
+        
+        self.assertEqual(duplicates, [(second_id, first_id)])
+        self.assertEqual([info['id'] for info in self.edit.get_image_data()], [first_id])
+    
+    def test_paste_again_after_removal(self):
+        """删除图片后再次粘贴同一张图片会重新添加"""
+        first_id = self._paste((11, 12, 13))
+        self._settle()
+        self.edit.remove_image(first_id)
+        second_id = self._paste((11, 12, 13))
+        self._settle()
+        
+        self.assertEqual([info['id'] for info in self.edit.get_image_data()], [second_id])
+    
+    def test_removed_while_hashing_leaves_no_stale_key(self):
+        """计算内容摘要期间删除的图片不会登记摘要，再次粘贴不会被误判为重复"""
+        from ui.widgets.feedback_text_edit import FeedbackTextEdit
+        removed = []
+        
+        def key_then_remove(image):
+            # 模拟用户在编码线程计算哈希时删除了这张图片
+            key = FeedbackTextEdit._image_content_key(image)
+            if not removed:
+                removed.append(self.edit.remove_image(self.edit._image_data[-1]['id']))
+            return key
+        
+        self.edit._image_content_key = key_then_remove
+        self._paste((14, 15, 16))
+        self._settle()
+        self.assertEqual(removed, [True])
+        self.assertEqual(self.edit._image_keys, {})
+        
+        second_id = self._paste((14, 15, 16))
+        self._settle()
+        self.assertEqual([info['id'] for info in self.edit.get_image_data()], [second_id])
+    
+    def test_content_key_ignores_row_padding(self):
+        """行末对齐填充字节不同的相同图片得到相同的内容摘要"""
+        from PySide6.QtGui import QImage, QColor
+        from ui.widgets.feedback_text_edit import FeedbackTextEdit
+        keys = []
+        for padding in (0x00, 0xff):
+            image = QImage(3, 3, QImage.Format_RGB888)  # 每行9字节，按4字节对齐后有3字节填充
+            image.fill(QColor(40, 50, 60))
+            bits = image.bits()
+            for row in range(image.height()):
+                start = row * image.bytesPerLine() + image.width() * 3
+                bits[start:(row + 1) * image.bytesPerLine()] = bytes([padding]) * (image.bytesPerLine() - image.width() * 3)
+            keys.append(FeedbackTextEdit._image_content_key(image))
+        self.assertEqual(keys[0], keys[1])
+    
+    def test_clear_images(self):
+        """清空后不再有任何图片数据"""
+        self._paste((20, 20, 20))
+        self._paste((30, 30, 30), alpha=50)
+        self.edit.clear_images()
+        self.assertEqual(self.edit.get_image_data(), [])
+
+class TestMarkdownDetection(unittest.TestCase):
+    """Markdown格式检测测试（与逐行逐个正则匹配的原实现结果一致）"""
+    
+    # 19行不含Markdown语法的普通文本，用于压低特征密度
+    FILLER = "\n".join(f"普通文本第{i}行" for i in range(19))
+    
+    CASES = [
+        # 空文本
+        ("", False),
+        ("   \n  ", False),
+        # 明确的块级特征：直接判定
+        ("# 标题", True),
+        ("```\ncode", True),
+        ("  > 引用", True),
+        ("- 项目", True),
+        ("1. 第一步", True),
+        ("| a | b |", True),
+        ("---", True),
+        ("===", True),
+        # 块级特征中的空白不能跨行匹配
+        ("#标题", False),
+        ("#\n标题", False),
+        ("1.\n第一步", False),
+        ("--\n-", False),
+        # 同一行命中两种行内语法（粗体同时命中斜体）
+        ("**粗体**", True),
+        # 同一语法在同一行出现多次只计一次，分布在两行计两次
+        ("a `x` b `y` c\n" + FILLER, False),
+        ("a `x` b\n" + FILLER + "\nc `y` d", True),
+        # 两种不同的行内语法
+        ("`x` 与 [链接](url)\n" + FILLER, True),
+        # 只有一个特征时按密度（特征数/行数 > 0.1）判断
+        ("使用 `code` 命令", True),
+        ("\n".join(["行"] * 8) + "\n`x`", True),
+        ("\n".join(["行"] * 9) + "\n`x`", False),
+        # 行内语法不能跨行
+        ("a*b\nc*d", False),
+        ("`a\nb`", False),
+        # 字面转义的换行先经过预处理
+        ("第一行\\n# 标题", True),
+    ]
+    
+    def test_is_markdown_cases(self):
+        """逐条检查各判定分支"""
+        from ui.components.text_processing import TextProcessor
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(TextProcessor.is_markdown(text), expected)
+
 class TestPerformanceMonitoring(unittest.TestCase):
     """性能监控测试"""
     
@@ -291,6 +465,8 @@ def run_ui_tests():
     # 添加测试类
     test_classes = [
         TestThreeColumnFeedbackUI,
+        TestFeedbackTextEditImages,
+        TestMarkdownDetection,
         TestPerformanceMonitoring,
         TestResponsiveDesign
     ]
@@ -1,8 +1,14 @@
 # UI Module for Interactive Feedback MCP
 # 交互式反馈MCP的UI模块
+# 子模块按需加载：仅导入 ui.utils.logging_system 等工具时不会拉起 PySide6 组件
 
-from .components.main_window import FeedbackUI
-from .widgets.feedback_text_edit import FeedbackTextEdit
-from .styles.glassmorphism import GlassmorphismStyles
+from .utils.lazy import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    'FeedbackUI': '.components.main_window',
+    'FeedbackTextEdit': '.widgets.feedback_text_edit',
+    'GlassmorphismStyles': '.styles.glassmorphism',
+})
+
+__all__ = ['FeedbackUI', 'FeedbackTextEdit', 'GlassmorphismStyles']
 
-__all__ = ['FeedbackUI', 'FeedbackTextEdit', 'GlassmorphismStyles'] 
\ No newline at end of file
@@ -1,7 +1,12 @@
 # Components Module
-# 主要组件模块
+# 主要组件模块（按需加载）
 
-from .main_window import FeedbackUI
-from .text_processing import TextProcessor
+from ..utils.lazy import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    'FeedbackUI': '.main_window',
+    'TextProcessor': '.text_processing',
+})
+
+__all__ = ['FeedbackUI', 'TextProcessor']
 
-__all__ = ['FeedbackUI', 'TextProcessor'] 
\ No newline at end of file
@@ -7,7 +7,6 @@ import sys
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
     QScrollArea, QGridLayout, QPushButton, QComboBox,
@@ -21,6 +20,8 @@ from PySide6.QtCharts import (
     QLegend
 )
 
+from ..utils.json_io import write_json
+
 @dataclass
 class FeedbackData:
     """反馈数据结构"""
@@ -573,8 +574,7 @@ class DataVisualizationWidget(QWidget):
             }
             
             filename = f"feedback_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            write_json(filename, report_data)
             
             print(f"📁 报告已导出: {filename}")
             
@@ -4,27 +4,76 @@ Enhanced Markdown Renderer for Interactive Feedback MCP
 增强的Markdown渲染器 - 方案A实现
 """
 
+import os
 import re
 import hashlib
+from functools import lru_cache
+from importlib import metadata
+from importlib.util import find_spec
+from pathlib import Path
 from typing import Dict, Optional
 from urllib.parse import urlparse
 
-try:
-    import markdown
-    from markdown.extensions import codehilite, fenced_code, tables, toc
-    from pygments.formatters import HtmlFormatter
-    from pygments import highlight
-    from pygments.lexers import get_lexer_by_name, guess_lexer
-    from pygments.util import ClassNotFound
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+# markdown和pygments导入较慢：启动时只检查是否已安装，首次实际渲染时再导入
+# （提示HTML命中持久化缓存时完全不需要导入）
+MARKDOWN_AVAILABLE = find_spec("markdown") is not None and find_spec("pygments") is not None
+if not MARKDOWN_AVAILABLE:
     print("⚠️ python-markdown 或 pygments 未安装，使用基础渲染")
 
 from PySide6.QtWidgets import QTextBrowser, QApplication
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QUrl, QStandardPaths
 from PySide6.QtGui import QDesktopServices
 
+from .text_processing import TextProcessor
+from ..utils.json_io import read_json, write_json
+from ..utils.logging_system import get_logger
+
+logger = get_logger('markdown_renderer')
+
+# 渲染结果的持久化缓存：用户缓存目录下的单个小文件（不写入QSettings/注册表）
+_PROMPT_HTML_CACHE_DIR = "InteractiveFeedbackMCP"
+_PROMPT_HTML_CACHE_FILE = "prompt_html_cache.json"
+
+@lru_cache(maxsize=None)
+def _renderer_stamp() -> str:
+    """渲染器版本：本文件修改时间 + markdown/pygments版本（代码高亮输出和样式随版本变化）"""
+    parts = [str(os.stat(__file__).st_mtime_ns)]
+    for dist in ("markdown", "pygments"):
+        try:
+            parts.append(f"{dist}={metadata.version(dist)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{dist}=none")
+    return ";".join(parts)
+
+@lru_cache(maxsize=None)
+def _prompt_html_cache_path() -> Path:
+    """持久化缓存文件路径"""
+    cache_root = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    return Path(cache_root) / _PROMPT_HTML_CACHE_DIR / _PROMPT_HTML_CACHE_FILE
+
+# 文本清理用的正则表达式（模块加载时编译一次，每次渲染直接复用）
+# 强化乱码字符清理：所有乱码字符合并为一个字符类，一次扫描完成替换
+_GARBLED_CHARS_RE = re.compile(
+    r'['
+    r'\ufffd'                                 # 替换字符（菱形问号）
+    r'\u25c6\u25c7\u2666'                     # 菱形符号（根据用户反馈的◇◇问题）
+    r'\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f'   # 控制字符（保留换行、制表符、回车）
+    r']+'
+)
+# 只匹配需要改写的空白（单个空格保持不变，避免无意义的替换）
+_HORIZONTAL_SPACE_RE = re.compile(r'[ \t]{2,}|\t')
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+_MARKDOWN_TITLE_LINE_RE = re.compile(r'^(#{1,6}\s*)(.*)$', re.MULTILINE)
+_TITLE_DISALLOWED_CHARS_RE = re.compile(
+    r'[^\u4e00-\u9fff\u3000-\u303f\uff00-\uffef'  # 中文字符范围
+    r'a-zA-Z0-9\s'  # 英文字母、数字、空格
+    r'\U0001f300-\U0001f9ff\u2600-\u26ff\u2700-\u27bf'  # emoji
+    r'!@#$%^&*()_+\-=\[\]{};\':"\\|,.<>?/~`'  # 常用符号
+    r'（）【】《》""''：；，。？！—…·'  # 中文标点
+    r']+'
+)
+
 class EnhancedMarkdownRenderer:
     """增强的Markdown渲染器"""
     
@@ -32,46 +81,60 @@ class EnhancedMarkdownRenderer:
         self.cache = {}
         self.max_cache_size = 100
         
-        if MARKDOWN_AVAILABLE:
-            self._setup_markdown()
-        else:
-            self.md = None
+        # markdown实例在首次需要渲染时才创建（见 _setup_markdown）
+        self.md = None
+        self.pygments_css = ""
+        
+        # 持久化缓存文件的内容（首次查询时读取一次，之后只在写入时更新）
+        self._persisted_entry = None
     
-    def _setup_markdown(self):
-        """设置markdown渲染器"""
-        self.md = markdown.Markdown(
-            extensions=[
-                'codehilite',      # 代码高亮
-                'fenced_code',     # 围栏代码块
-                'tables',          # 表格支持
-                'toc',             # 目录生成
-                'admonition',      # 警告框
-                'attr_list',       # 属性列表
-                'def_list',        # 定义列表
-                'footnotes',       # 脚注
-                'nl2br',           # 换行转换
-                'sane_lists',      # 智能列表
-                'smarty',          # 智能标点
-                'abbr',            # 缩写
-                'meta',            # 元数据
-            ],
-            extension_configs={
-                'codehilite': {
-                    'css_class': 'highlight',
-                    'use_pygments': True,
-                    'pygments_style': 'monokai',
-                    'linenums': False,
-                    'guess_lang': True
-                },
-                'toc': {
-                    'permalink': True,
-                    'permalink_title': '链接到此标题'
+    def _setup_markdown(self) -> bool:
+        """设置markdown渲染器（延迟导入markdown和pygments），导入失败时返回False"""
+        global MARKDOWN_AVAILABLE
+        try:
+            import markdown
+            from pygments.formatters import HtmlFormatter
+            
+            self.md = markdown.Markdown(
+                extensions=[
+                    'codehilite',      # 代码高亮
+                    'fenced_code',     # 围栏代码块
+                    'tables',          # 表格支持
+                    'toc',             # 目录生成
+                    'admonition',      # 警告框
+                    'attr_list',       # 属性列表
+                    'def_list',        # 定义列表
+                    'footnotes',       # 脚注
+                    'nl2br',           # 换行转换
+                    'sane_lists',      # 智能列表
+                    'smarty',          # 智能标点
+                    'abbr',            # 缩写
+                    'meta',            # 元数据
+                ],
+                extension_configs={
+                    'codehilite': {
+                        'css_class': 'highlight',
+                        'use_pygments': True,
+                        'pygments_style': 'monokai',
+                        'linenums': False,
+                        'guess_lang': True
+                    },
+                    'toc': {
+                        'permalink': True,
+                        'permalink_title': '链接到此标题'
+                    }
                 }
-            }
-        )
+            )
         
-        # 获取Pygments CSS样式
-        self.pygments_css = HtmlFormatter(style='monokai').get_style_defs('.highlight')
+            # 获取Pygments CSS样式
+            self.pygments_css = HtmlFormatter(style='monokai').get_style_defs('.highlight')
+        except ImportError as e:
+            # 已安装但无法导入（如扩展依赖缺失），之后都使用基础渲染
+            MARKDOWN_AVAILABLE = False
+            self.md = None
+            print(f"⚠️ python-markdown 或 pygments 导入失败，使用基础渲染: {e}")
+            return False
+        return True
     
     def render(self, text: str) -> str:
         """渲染markdown文本为HTML"""
@@ -83,10 +146,14 @@ class EnhancedMarkdownRenderer:
         if text_hash in self.cache:
             return self.cache[text_hash]
         
-        if MARKDOWN_AVAILABLE and self.md:
-            html = self._render_with_markdown(text)
-        else:
-            html = self._render_basic(text)
+        # MCP服务器经常用相同的提示重复启动UI：先查跨进程的持久化缓存
+        html = self._load_persisted_html(text_hash)
+        if html is None:
+            if MARKDOWN_AVAILABLE and (self.md is not None or self._setup_markdown()):
+                html = self._render_with_markdown(text)
+            else:
+                html = self._render_basic(text)
+            self._persist_html(text_hash, html)
         
         # 添加到缓存
         if len(self.cache) >= self.max_cache_size:
@@ -97,6 +164,44 @@ class EnhancedMarkdownRenderer:
         self.cache[text_hash] = html
         return html
     
+    @staticmethod
+    def _persisted_cache_key(text_hash: str) -> str:
+        """持久化缓存键：内容哈希 + 渲染器版本，渲染逻辑或依赖版本变化后旧结果自动失效"""
+        return f"{text_hash}:{_renderer_stamp()}:{int(MARKDOWN_AVAILABLE)}"
+    
+    def _load_persisted_entry(self) -> Dict[str, str]:
+        """读取缓存文件中保存的上次渲染结果（每个渲染器只读取一次）"""
+        if self._persisted_entry is None:
+            try:
+                cached = read_json(_prompt_html_cache_path())
+            except (OSError, ValueError):
+                cached = None
+            self._persisted_entry = cached if isinstance(cached, dict) else {}
+        return self._persisted_entry
+    
+    def _load_persisted_html(self, text_hash: str) -> Optional[str]:
+        """读取上次渲染结果（只保留最近一条，避免缓存文件无限增长）"""
+        entry = self._load_persisted_entry()
+        if entry.get("key") == self._persisted_cache_key(text_hash):
+            return entry.get("html")
+        return None
+    
+    def _persist_html(self, text_hash: str, html: str):
+        """保存本次渲染结果，覆盖上一条（已保存相同键时不再写入）"""
+        key = self._persisted_cache_key(text_hash)
+        if self._load_persisted_entry().get("key") == key:
+            return
+        entry = {"key": key, "html": html}
+        path = _prompt_html_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 多个UI进程可能同时读写该文件：先写临时文件再替换，避免读到写了一半的内容
+            write_json(path, entry, indent=None, atomic=True)
+        except OSError as e:
+            logger.warning(f"提示渲染缓存写入失败: {path}, {e}")
+            return
+        self._persisted_entry = entry
+    
     def _render_with_markdown(self, text: str) -> str:
         """使用python-markdown渲染"""
         try:
@@ -110,7 +215,7 @@ class EnhancedMarkdownRenderer:
                 text = str(text)
             
             # 清理乱码字符（但严格保留emoji）
-            text = self._clean_garbled_text(text)
+            text = self.clean_text(text)
             
             # 清理标题中的非常规字符
             text = self._clean_title_characters(text)
@@ -164,7 +269,7 @@ class EnhancedMarkdownRenderer:
             text = str(text)
         
         # 清理乱码字符
-        text = self._clean_garbled_text(text)
+        text = self.clean_text(text)
             
         # 简单的文本到HTML转换
         html = text.replace('\n', '<br>')
@@ -574,73 +679,51 @@ class EnhancedMarkdownRenderer:
         }
         """
 
-    def _clean_garbled_text(self, text: str) -> str:
+    def clean_text(self, text: str) -> str:
         """清理乱码字符，但保留所有有效Unicode字符"""
-        import re
-        
-        # 强化乱码字符清理，包含特定的乱码符号
-        replacements = {
-            # 替换字符（菱形问号）
-            r'[�]+': '',
-            r'[\ufffd]+': '',
-            # 特定的乱码符号（根据用户反馈的◇◇问题）
-            r'[◇◆]+': '',
-            r'[◇]+': '',
-            r'[◆]+': '',
-            # 控制字符（但保留换行、制表符、回车）
-            r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]': '',
-            # 移除NULL字符
-            r'\x00': '',
-            # 其他可能的特殊符号
-            r'[\u2666\u25c7\u25c6]+': '',  # Unicode菱形符号
-        }
-        
-        cleaned_text = text
-        for pattern, replacement in replacements.items():
-            cleaned_text = re.sub(pattern, replacement, cleaned_text)
+        cleaned_text = _GARBLED_CHARS_RE.sub('', text)
         
         # 规范化空白字符（但保留所有换行）
-        cleaned_text = re.sub(r'[ \t]+', ' ', cleaned_text)
+        cleaned_text = _HORIZONTAL_SPACE_RE.sub(' ', cleaned_text)
         # 限制连续空行为最多2个
-        cleaned_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned_text)
+        cleaned_text = _EXTRA_BLANK_LINES_RE.sub('\n\n', cleaned_text)
         
         return cleaned_text
     
     def _clean_title_characters(self, text: str) -> str:
         """清理标题中的非常规字符，保留中文、英文、数字、常用符号"""
-        import re
-        
         # 匹配markdown标题行
         def clean_title_line(match):
             title_prefix = match.group(1)  # ### 等标题标记
             title_content = match.group(2)  # 标题内容
             
             # 清理标题内容，保留中文、英文、数字、常用符号和emoji
-            cleaned_content = re.sub(
-                r'[^\u4e00-\u9fff\u3000-\u303f\uff00-\uffef'  # 中文字符范围
-                r'a-zA-Z0-9\s'  # 英文字母、数字、空格
-                r'\U0001f300-\U0001f9ff\u2600-\u26ff\u2700-\u27bf'  # emoji
-                r'!@#$%^&*()_+\-=\[\]{};\':"\\|,.<>?/~`'  # 常用符号
-                r'（）【】《》""''：；，。？！—…·'  # 中文标点
-                r']+', '', title_content
-            )
+            cleaned_content = _TITLE_DISALLOWED_CHARS_RE.sub('', title_content)
             
             # 移除多余空格
-            cleaned_content = re.sub(r'\s+', ' ', cleaned_content).strip()
+            cleaned_content = _WHITESPACE_RUN_RE.sub(' ', cleaned_content).strip()
             
             return f"{title_prefix}{cleaned_content}"
         
         # 处理所有级别的markdown标题
-        text = re.sub(r'^(#{1,6}\s*)(.*)$', clean_title_line, text, flags=re.MULTILINE)
+        text = _MARKDOWN_TITLE_LINE_RE.sub(clean_title_line, text)
         
         return text
 
+
+@lru_cache(maxsize=1)
+def get_shared_renderer() -> EnhancedMarkdownRenderer:
+    """获取进程内共享的渲染器实例（markdown实例与HTML缓存在各浏览器间复用）"""
+    return EnhancedMarkdownRenderer()
+
+
 class EnhancedTextBrowser(QTextBrowser):
     """增强的文本浏览器，支持高级markdown渲染"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.renderer = EnhancedMarkdownRenderer()
+        self.renderer = get_shared_renderer()
+        self._current_markdown = None
         
         # 启用链接处理
         self.setOpenExternalLinks(True)  # 允许外部链接直接打开
@@ -658,9 +741,22 @@ class EnhancedTextBrowser(QTextBrowser):
         """)
     
     def set_markdown_content(self, markdown_text: str):
-        """设置markdown内容"""
-        html = self.renderer.render(markdown_text)
-        self.setHtml(html)
+        """设置markdown内容（内容未变化时不重新解析和排版）"""
+        if markdown_text == self._current_markdown:
+            return
+        if TextProcessor.has_markdown_syntax(markdown_text):
+            html = self.renderer.render(markdown_text)
+            super().setHtml(html)
+        else:
+            # 纯文本提示：直接作为纯文本文档显示，跳过markdown渲染和QTextDocument的HTML/CSS解析
+            # 颜色、字号和内边距由控件样式表提供
+            super().setPlainText(self.renderer.clean_text(markdown_text))
+        self._current_markdown = markdown_text
+
+    def setHtml(self, html: str):
+        """直接设置HTML时清除markdown记录，保证下次 set_markdown_content 生效"""
+        self._current_markdown = None
+        super().setHtml(html)
     
     def _handle_link_click(self, url: QUrl):
         """处理链接点击"""
@@ -3,6 +3,8 @@
 
 import os
 import sys
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional, List, TypedDict
 
 from PySide6.QtWidgets import (
@@ -16,6 +18,18 @@ from PySide6.QtGui import QIcon, QShortcut, QKeySequence, QFont
 from ..widgets.feedback_text_edit import FeedbackTextEdit
 from ..styles.glassmorphism import GlassmorphismStyles
 from ..components.text_processing import TextProcessor
+from ..utils.responsive import ScreenSizeManager
+
+_FEEDBACK_ICON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "images", "feedback.png"
+)
+
+@lru_cache(maxsize=None)
+def _feedback_icon() -> Optional[QIcon]:
+    """窗口图标只从磁盘加载并解码一次，同一进程内的多个窗口共享"""
+    if os.path.exists(_FEEDBACK_ICON_PATH):
+        return QIcon(_FEEDBACK_ICON_PATH)
+    return None
 
 class FeedbackResult(TypedDict):
     interactive_feedback: str
@@ -29,6 +43,7 @@ class FeedbackUI(QMainWindow):
         self.prompt = prompt
         self.predefined_options = predefined_options or []
         self.feedback_result = None
+        self._saved_font_applied = False
         
         # 初始化文本处理器
         self.text_processor = TextProcessor()
@@ -43,10 +58,9 @@ class FeedbackUI(QMainWindow):
         self.setWindowTitle("Cursor 交互式反馈 MCP")
         
         # 设置图标
-        script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        icon_path = os.path.join(script_dir, "images", "feedback.png")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+        icon = _feedback_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
         
         # 设置窗口属性
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -62,7 +76,7 @@ class FeedbackUI(QMainWindow):
         self.line_height = self._load_line_height()
         
         # 设置窗口大小和位置
-        screen = QApplication.primaryScreen().geometry()
+        screen = ScreenSizeManager.primary_screen_geometry()
         screen_height = screen.height()
         window_height = int(screen_height * 0.7)
         window_width = 800
@@ -110,6 +124,8 @@ class FeedbackUI(QMainWindow):
         self.description_text.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.description_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.description_text.setStyleSheet(GlassmorphismStyles.text_browser())
+        # 静态Markdown样式作为文档默认样式表只解析一次，切换行高重新setHtml时不再重复解析
+        self.description_text.document().setDefaultStyleSheet(TextProcessor.MARKDOWN_CSS)
         
         self._update_description_text()
         layout.addWidget(self.description_text)
@@ -159,7 +175,9 @@ class FeedbackUI(QMainWindow):
     def _create_text_input_area(self, layout):
         """创建文本输入区域"""
         self.feedback_text = FeedbackTextEdit()
+        self._preview_image_ids = set()  # 预览区中已显示的图片ID
         self.feedback_text.image_pasted.connect(self._on_image_pasted)
+        self.feedback_text.image_duplicate.connect(self._on_image_duplicate)
         # 连接提交请求信号
         self.feedback_text.submit_requested.connect(self._submit_feedback)
         self.feedback_text.setStyleSheet(GlassmorphismStyles.text_edit())
@@ -273,7 +291,7 @@ class FeedbackUI(QMainWindow):
         """更新描述文本内容"""
         if self.text_processor.is_markdown(self.prompt):
             print("检测到Markdown格式")
-            html_content = self.text_processor.convert_markdown_to_html(self.prompt, self.line_height)
+            html_content = self.text_processor.convert_markdown_to_html(self.prompt, self.line_height, include_css=False)
         else:
             print("检测到文本类型: 普通文本")
             html_content = self.text_processor.convert_text_to_html(self.prompt, self.line_height)
@@ -342,18 +360,26 @@ class FeedbackUI(QMainWindow):
 
     def _update_all_fonts(self):
         """更新UI中所有控件的字体"""
-        def update_widget_font(widget):
-            widget.setFont(QApplication.font())
-            
-            if isinstance(widget, QCheckBox):
-                font_size = QApplication.font().pointSize()
-                icon_size = max(16, int(font_size * 1.2))
-                widget.setStyleSheet(widget.styleSheet() + f"""
+        # 应用字体和复选框指示器样式只计算一次，递归中复用
+        app_font = QApplication.font()
+        icon_size = max(16, int(app_font.pointSize() * 1.2))
+        indicator_style = f"""
                     QCheckBox::indicator {{
                         width: {icon_size}px;
                         height: {icon_size}px;
                     }}
-                """)
+                """
+
+        def update_widget_font(widget):
+            widget.setFont(app_font)
+            
+            if isinstance(widget, QCheckBox):
+                # 基于原始样式追加，避免多次调整字体后样式表不断变长
+                base_style = widget.property("_base_style_sheet")
+                if base_style is None:
+                    base_style = widget.styleSheet()
+                    widget.setProperty("_base_style_sheet", base_style)
+                widget.setStyleSheet(base_style + indicator_style)
 
             for child in widget.children():
                 if isinstance(child, QWidget):
@@ -362,8 +388,11 @@ class FeedbackUI(QMainWindow):
         update_widget_font(self)
 
     def showEvent(self, event):
-        """窗口显示时加载保存的字体大小"""
+        """窗口首次显示时加载保存的字体大小（之后的字体调整由快捷键直接应用，最小化恢复时无需重新遍历控件）"""
         super().showEvent(event)
+        if self._saved_font_applied:
+            return
+        self._saved_font_applied = True
         app = QApplication.instance()
         saved_size = self._load_font_size()
         current_font = app.font()
@@ -376,13 +405,12 @@ class FeedbackUI(QMainWindow):
         print("🚀 开始处理反馈提交...")
         
         feedback_text = self.feedback_text.toPlainText().strip()
-        selected_options = []
 
-        # 获取选中的预定义选项
-        if self.option_checkboxes:
-            for i, checkbox in enumerate(self.option_checkboxes):
-                if checkbox.isChecked():
-                    selected_options.append(self.predefined_options[i])
+        # 获取选中的预定义选项（复选框与选项文本按创建顺序一一对应）
+        selected_options = [
+            option for checkbox, option in zip(self.option_checkboxes, self.predefined_options)
+            if checkbox.isChecked()
+        ]
 
         # 获取图片数据
         image_data = self.feedback_text.get_image_data()
@@ -397,7 +425,7 @@ class FeedbackUI(QMainWindow):
             print(f"📝 文本内容长度: {len(feedback_text)}字符")
 
         final_feedback = "\n\n".join(final_feedback_parts)
-        images_b64 = [img['base64'] for img in image_data]
+        images_b64 = list(map(itemgetter('base64'), image_data))
         
         if image_data:
             print(f"🖼️ 包含图片: {len(image_data)}张")
@@ -428,7 +456,7 @@ class FeedbackUI(QMainWindow):
 
         return self.feedback_result
 
-    def _on_image_pasted(self, pixmap):
+    def _on_image_pasted(self, pixmap, image_id=None):
         """处理粘贴的图片"""
         # 确保图片容器可见
         if not self.images_container.isVisible():
@@ -436,6 +464,19 @@ class FeedbackUI(QMainWindow):
             self.scroll_area.setVisible(True)
             self.images_layout.addStretch(1)
 
+        if image_id is not None:
+            self._preview_image_ids.add(image_id)
+
         # 创建图片预览（这里可以添加具体的图片预览实现）
         # 由于代码较长，这里简化处理
-        print(f"图片已添加到预览区域，大小: {pixmap.width()}x{pixmap.height()}") 
\ No newline at end of file
+        print(f"图片已添加到预览区域，大小: {pixmap.width()}x{pixmap.height()}")
+
+    def _on_image_duplicate(self, image_id, existing_id):
+        """重复粘贴的图片已由输入框丢弃，没有其他图片时同时隐藏预览区"""
+        self._preview_image_ids.discard(image_id)
+        if not self._preview_image_ids and self.images_container.isVisible():
+            self.images_container.setVisible(False)
+            self.scroll_area.setVisible(False)
+            # 移除显示预览区时添加的弹性空间，下次粘贴时会重新添加
+            while self.images_layout.count():
+                self.images_layout.takeAt(0)
\ No newline at end of file
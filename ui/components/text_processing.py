@@ -4,18 +4,139 @@
 
 import re
 import json
+import logging
+from functools import lru_cache
+from importlib.util import find_spec
+
+from ..utils.logging_system import get_logger
+
+logger = get_logger('text_processing')
+
+# 启动时只检查markdown是否已安装，实际导入推迟到首次渲染Markdown时（见 TextProcessor._get_markdown）
+MARKDOWN_AVAILABLE = find_spec("markdown") is not None
+
+# Markdown语法的特征字符：不含这些字符的纯文本无需经过markdown解析
+_MARKDOWN_SYNTAX_CHARS = frozenset('*#`[]|>_')
+_MARKDOWN_BLOCK_START_RE = re.compile(r'^\s*(?:[-+]\s|\d+\.\s|[-=]{3,}\s*$)', re.MULTILINE)
+_FENCED_CODE_RE = re.compile(r'^\s*(?:```|~~~)', re.MULTILINE)
+
+# is_markdown 使用的语法特征（模块加载时编译一次，对整段文本扫描而不是逐行逐个匹配）
+# [^\S\n] 为不含换行的空白，保证每个匹配都不跨行，与逐行判断的结果一致
+_MARKDOWN_DEFINITIVE_RE = re.compile(
+    r'^#{1,6}[^\S\n]+.+'          # 标题: # 标题文本
+    r'|^[^\S\n]*```'              # 代码块: ```
+    r'|^[^\S\n]*>'                # 引用: > 文本
+    r'|^[^\S\n]*[-*+][^\S\n]+'    # 无序列表: - 项目 或 * 项目 或 + 项目
+    r'|^[^\S\n]*\d+\.[^\S\n]+'    # 有序列表: 1. 项目
+    r'|\|.+\|.+\|'                # 表格
+    r'|^-{3,}$'                   # 水平线: ---
+    r'|^={3,}$',                  # 水平线: ===
+    re.MULTILINE
+)
+_MARKDOWN_INLINE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\*\*.+?\*\*',                   # 粗体: **文本**
+    r'\*.+?\*',                       # 斜体: *文本*
+    r'_.+?_',                         # 斜体: _文本_
+    r'`[^`\n]+`',                     # 行内代码: `代码`
+    r'\[.+?\]\(.+?\)',                # 链接: [文本](URL)
+    r'!\[.+?\]\(.+?\)',               # 图片: ![alt](URL)
+))
+
+# 普通文本提示的HTML包装（模块加载时构建一次，%s 处填入行高）
+# 去除多余的缩进，添加emoji字体支持；使用更具体的字体列表以保证跨平台一致性
+_PLAIN_TEXT_HTML_PREFIX = """<div style="
+            line-height: %s;
+            color: #ccc;
+            font-family: 'PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', 'SimHei', 'Segoe UI', system-ui, -apple-system, sans-serif, 'Apple Color Emoji', 'Segoe UI Emoji', 'Noto Color Emoji';
+            white-space: pre-wrap;
+        ">"""
+_PLAIN_TEXT_HTML_SUFFIX = "</div>"
+
+# Markdown描述区域中与行高无关的样式（模块加载时构建一次）
+_MARKDOWN_CSS = """
+    /* 标题样式 */
+    h1 { color: #FF9800; margin: 12px 0 8px 0; font-size: 1.3em; }
+    h2 { color: #2196F3; margin: 10px 0 6px 0; font-size: 1.2em; }
+    h3 { color: #4CAF50; margin: 10px 0 6px 0; font-size: 1.1em; }
+
+    /* 列表样式 */
+    ul, ol {
+        margin: 6px 0;
+        padding-left: 20px;
+    }
+    li {
+        vertical-align: baseline;
+        display: list-item;
+        text-align: left;
+    }
+
+    /* 代码样式 */
+    code {
+        background-color: rgba(255,255,255,0.1);
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-family: 'Consolas', 'Monaco', monospace;
+        font-size: 0.9em;
+    }
+
+    pre {
+        background-color: rgba(255,255,255,0.05);
+        padding: 12px;
+        border-radius: 6px;
+        overflow-x: auto;
+        border-left: 4px solid #2196F3;
+    }
+
+    /* 段落样式 - 已在 .md-content p 中处理 */
+    p { }
+
+    /* 强调样式 */
+    strong { color: #FFD54F; }
+    em { color: #81C784; }
+
+    /* Emoji样式优化 */
+    .emoji, img.emoji {
+        height: 1.2em;
+        width: 1.2em;
+        margin: 0 0.05em 0 0.1em;
+        vertical-align: -0.1em;
+        display: inline-block;
+    }
+
+    /* 表格样式 */
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin: 10px 0;
+    }
+    th, td {
+        border: 1px solid #444;
+        padding: 8px;
+        text-align: left;
+    }
+    th {
+        background-color: rgba(255,255,255,0.1);
+        font-weight: bold;
+    }
+"""
 
 class TextProcessor:
     """文本处理工具类"""
     
+    # 与行高无关的Markdown样式，可设置为QTextDocument的默认样式表，只解析一次
+    MARKDOWN_CSS = _MARKDOWN_CSS
+    
     @staticmethod
+    @lru_cache(maxsize=32)
     def preprocess_text(text: str) -> str:
         """
         预处理文本，处理转义字符问题
         特别处理从Cursor编辑器传入时的转义问题
         """
-        # 记录原始文本（用于调试）
-        print(f"原始文本: {repr(text)}")
+        # 记录原始文本（用于调试；只有启用DEBUG级别时才生成整段文本的repr）
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("原始文本: %r", text)
 
         # 处理字面上的转义序列
         if isinstance(text, str):
@@ -27,12 +148,13 @@ class TextProcessor:
                 if '\\n' in text or '\\t' in text or '\\r' in text:
                     # 添加引号使其成为有效JSON字符串，然后解码
                     decoded_text = json.loads(f'"{text}"')
-                    print(f"JSON解码成功: {repr(decoded_text)}")
+                    if debug_enabled:
+                        logger.debug("JSON解码成功: %r", decoded_text)
                     text = decoded_text
                 else:
-                    print("不需要JSON解码")
+                    logger.debug("不需要JSON解码")
             except (json.JSONDecodeError, ValueError):
-                print("JSON解码失败，使用字符串替换方法")
+                logger.debug("JSON解码失败，使用字符串替换方法")
                 # 如果JSON解码失败，使用字符串替换方法
 
                 # 先检查是否存在双重转义（如 \\n）
@@ -54,10 +176,12 @@ class TextProcessor:
             text = text.replace('\r', '\n')
 
         # 记录处理后的文本（用于调试）
-        print(f"预处理后文本: {repr(text)}")
+        if debug_enabled:
+            logger.debug("预处理后文本: %r", text)
         return text
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def is_markdown(text: str) -> bool:
         """
         检测文本是否可能是Markdown格式
@@ -70,42 +194,32 @@ class TextProcessor:
         # 预处理文本，处理转义字符
         text = TextProcessor.preprocess_text(text)
 
-        # 检查常见的Markdown语法特征
-        markdown_patterns = [
-            r'^#{1,6}\s+.+',                  # 标题: # 标题文本
-            r'\*\*.+?\*\*',                   # 粗体: **文本**
-            r'\*.+?\*',                       # 斜体: *文本*
-            r'_.+?_',                         # 斜体: _文本_
-            r'`[^`]+`',                       # 行内代码: `代码`
-            r'^\s*```',                       # 代码块: ```
-            r'^\s*>',                         # 引用: > 文本
-            r'^\s*[-*+]\s+',                  # 无序列表: - 项目 或 * 项目 或 + 项目
-            r'^\s*\d+\.\s+',                  # 有序列表: 1. 项目
-            r'\[.+?\]\(.+?\)',                # 链接: [文本](URL)
-            r'!\[.+?\]\(.+?\)',               # 图片: ![alt](URL)
-            r'\|.+\|.+\|',                    # 表格
-            r'^-{3,}$',                       # 水平线: ---
-            r'^={3,}$',                       # 水平线: ===
-        ]
-
-        # 遍历文本的每一行，检查是否包含Markdown语法特征
-        lines = text.split('\n')
-        markdown_features_count = 0
-
-        for line in lines:
-            for pattern in markdown_patterns:
-                if re.search(pattern, line, re.MULTILINE):
-                    markdown_features_count += 1
-                    # 如果发现明确的Markdown特征，立即返回True
-                    if pattern in [r'^#{1,6}\s+.+', r'^\s*```', r'^\s*>', r'^\s*[-*+]\s+', r'^\s*\d+\.\s+', r'\|.+\|.+\|', r'^-{3,}$', r'^={3,}$']:
-                        return True
+        # 出现明确的Markdown特征（标题、代码块、引用、列表、表格、水平线）时直接判定
+        if _MARKDOWN_DEFINITIVE_RE.search(text):
+            return True
+
+        # 统计其余特征：每种行内语法在每一行上的匹配各计一次
+        # 判定只需区分0、1和不少于2，因此每种语法最多查找两次
+        features_count = 0
+        for pattern in _MARKDOWN_INLINE_PATTERNS:
+            match = pattern.search(text)
+            if match is None:
+                continue
+            features_count += 1
+            if features_count >= 2:
+                return True
+            # 同一语法出现在后面的行中也计入特征数
+            line_end = text.find('\n', match.start())
+            if line_end != -1 and pattern.search(text, line_end + 1):
+                return True
 
         # 如果文本中包含一定数量的Markdown特征，则视为Markdown
         # 这里根据特征数量和文本长度的比例来判断
         # 如果特征数量超过2个或特征密度较高，则视为Markdown
-        return markdown_features_count >= 2 or (markdown_features_count > 0 and markdown_features_count / len(lines) > 0.1)
+        return features_count > 0 and features_count / (text.count('\n') + 1) > 0.1
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def convert_text_to_html(text: str, line_height: float = 1.3) -> str:
         """
         将普通文本转换为HTML格式
@@ -113,69 +227,82 @@ class TextProcessor:
         """
         # 预处理文本，处理转义字符
         text = TextProcessor.preprocess_text(text)
+        return TextProcessor._plain_text_to_html(text, line_height)
+
+    @staticmethod
+    def has_markdown_syntax(text: str) -> bool:
+        """快速判断文本中是否可能含有Markdown语法（宁可误判为Markdown）"""
+        return not _MARKDOWN_SYNTAX_CHARS.isdisjoint(text) or _MARKDOWN_BLOCK_START_RE.search(text) is not None
 
+    @staticmethod
+    def _plain_text_to_html(text: str, line_height: float) -> str:
+        """将已预处理的普通文本转换为HTML"""
         # HTML转义
         escaped_text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
         # 保留换行
         html_text = escaped_text.replace("\n", "<br>")
 
-        # 应用样式，去除多余的缩进，添加emoji字体支持
-        # 减小行高，并使用更具体的字体列表以保证跨平台一致性
-        styled_html = f"""<div style="
-            line-height: {line_height};
-            color: #ccc;
-            font-family: 'PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', 'SimHei', 'Segoe UI', system-ui, -apple-system, sans-serif, 'Apple Color Emoji', 'Segoe UI Emoji', 'Noto Color Emoji';
-            white-space: pre-wrap;
-        ">{html_text}</div>"""
+        # 应用样式（模板为模块常量，只需填入行高）
+        return _PLAIN_TEXT_HTML_PREFIX % line_height + html_text + _PLAIN_TEXT_HTML_SUFFIX
 
-        return styled_html
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _get_markdown(with_codehilite: bool):
+        """按需创建并缓存Markdown实例（不含代码块的提示不加载codehilite/Pygments）"""
+        import markdown
+
+        # 配置markdown扩展，添加emoji支持
+        extensions = ['extra', 'toc']
+        if with_codehilite:
+            extensions.append('codehilite')
+
+        # 尝试添加emoji扩展（如果可用）
+        try:
+            import pymdownx.emoji
+            extensions.append('pymdownx.emoji')
+            extension_configs = {
+                'pymdownx.emoji': {
+                    'emoji_index': pymdownx.emoji.gemoji,
+                    'emoji_generator': pymdownx.emoji.to_svg,
+                    'alt': 'short',
+                    'options': {
+                        'attributes': {
+                            'align': 'absmiddle',
+                            'height': '20px',
+                            'width': '20px'
+                        },
+                        'image_path': 'https://assets-cdn.github.com/images/icons/emoji/unicode/',
+                        'non_standard_image_path': 'https://assets-cdn.github.com/images/icons/emoji/'
+                    }
+                }
+            }
+        except ImportError:
+            extension_configs = {}
+
+        return markdown.Markdown(extensions=extensions, extension_configs=extension_configs)
 
     @staticmethod
-    def convert_markdown_to_html(markdown_text: str, line_height: float = 1.3) -> str:
-        """使用markdown库将markdown转换为HTML"""
+    @lru_cache(maxsize=32)
+    def convert_markdown_to_html(markdown_text: str, line_height: float = 1.3, include_css: bool = True) -> str:
+        """使用markdown库将markdown转换为HTML（按提示文本和行高缓存结果）
+        
+        include_css为False时不内嵌MARKDOWN_CSS，由调用方通过QTextDocument.setDefaultStyleSheet提供。
+        """
         try:
             # 预处理文本，处理转义字符
             markdown_text = TextProcessor.preprocess_text(markdown_text)
 
-            import markdown
-            from markdown.extensions import codehilite, tables, toc
+            # 纯文本提示或未安装markdown库：跳过markdown库的导入和解析，只做HTML转义
+            if not MARKDOWN_AVAILABLE or not TextProcessor.has_markdown_syntax(markdown_text):
+                return TextProcessor._plain_text_to_html(markdown_text, line_height)
 
-            # 配置markdown扩展，添加emoji支持
-            extensions = ['extra', 'codehilite', 'toc']
-
-            # 尝试添加emoji扩展（如果可用）
-            try:
-                import pymdownx.emoji
-                extensions.append('pymdownx.emoji')
-                extension_configs = {
-                    'pymdownx.emoji': {
-                        'emoji_index': pymdownx.emoji.gemoji,
-                        'emoji_generator': pymdownx.emoji.to_svg,
-                        'alt': 'short',
-                        'options': {
-                            'attributes': {
-                                'align': 'absmiddle',
-                                'height': '20px',
-                                'width': '20px'
-                            },
-                            'image_path': 'https://assets-cdn.github.com/images/icons/emoji/unicode/',
-                            'non_standard_image_path': 'https://assets-cdn.github.com/images/icons/emoji/'
-                        }
-                    }
-                }
-            except ImportError:
-                extension_configs = {}
-
-            # 创建Markdown实例（使用缓存）
-            if not hasattr(TextProcessor, '_markdown_instance'):
-                TextProcessor._markdown_instance = markdown.Markdown(
-                    extensions=extensions,
-                    extension_configs=extension_configs
-                )
+            # 只有包含围栏代码块时才启用codehilite（会引入Pygments，导入开销大）
+            md = TextProcessor._get_markdown(_FENCED_CODE_RE.search(markdown_text) is not None)
+            md.reset()
 
             # 转换markdown到HTML
-            html = TextProcessor._markdown_instance.convert(markdown_text)
+            html = md.convert(markdown_text)
 
             # 应用自定义样式，去除多余的缩进，添加emoji支持
             # 统一设置基础样式，减小行高和段落间距
@@ -193,70 +320,7 @@ class TextProcessor:
                     white-space: pre-wrap;
                 }}
 
-                /* 标题样式 */
-                h1 {{ color: #FF9800; margin: 12px 0 8px 0; font-size: 1.3em; }}
-                h2 {{ color: #2196F3; margin: 10px 0 6px 0; font-size: 1.2em; }}
-                h3 {{ color: #4CAF50; margin: 10px 0 6px 0; font-size: 1.1em; }}
-
-                /* 列表样式 */
-                ul, ol {{
-                    margin: 6px 0;
-                    padding-left: 20px;
-                }}
-                li {{
-                    vertical-align: baseline;
-                    display: list-item;
-                    text-align: left;
-                }}
-
-                /* 代码样式 */
-                code {{
-                    background-color: rgba(255,255,255,0.1);
-                    padding: 2px 6px;
-                    border-radius: 4px;
-                    font-family: 'Consolas', 'Monaco', monospace;
-                    font-size: 0.9em;
-                }}
-
-                pre {{
-                    background-color: rgba(255,255,255,0.05);
-                    padding: 12px;
-                    border-radius: 6px;
-                    overflow-x: auto;
-                    border-left: 4px solid #2196F3;
-                }}
-
-                /* 段落样式 - 已在 .md-content p 中处理 */
-                p {{ }}
-
-                /* 强调样式 */
-                strong {{ color: #FFD54F; }}
-                em {{ color: #81C784; }}
-
-                /* Emoji样式优化 */
-                .emoji, img.emoji {{
-                    height: 1.2em;
-                    width: 1.2em;
-                    margin: 0 0.05em 0 0.1em;
-                    vertical-align: -0.1em;
-                    display: inline-block;
-                }}
-
-                /* 表格样式 */
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 10px 0;
-                }}
-                th, td {{
-                    border: 1px solid #444;
-                    padding: 8px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: rgba(255,255,255,0.1);
-                    font-weight: bold;
-                }}
+                {_MARKDOWN_CSS if include_css else ''}
             </style>
             <div class="md-content">{html}</div>
             """
@@ -266,9 +330,9 @@ class TextProcessor:
         except ImportError:
             # Fallback if markdown library is not installed
             # Log that markdown library is not found and basic conversion is used.
-            print("Markdown library not found. Using basic HTML escaping for description.")
+            logger.warning("Markdown library not found. Using basic HTML escaping for description.")
             return TextProcessor.convert_text_to_html(markdown_text, line_height)
         except Exception as e:
             # Fallback for any other error during markdown conversion
-            print(f"Error during markdown conversion: {e}. Using basic HTML escaping.")
+            logger.exception("Error during markdown conversion: %s. Using basic HTML escaping.", e)
             return TextProcessor.convert_text_to_html(markdown_text, line_height) 
\ No newline at end of file
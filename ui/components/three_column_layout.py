@@ -5,7 +5,9 @@
 import os
 import sys
 import subprocess
+import threading
 import time
+from operator import itemgetter
 from typing import Optional, List, TypedDict
 import re
 
@@ -14,7 +16,7 @@ from PySide6.QtWidgets import (
     QLabel, QPushButton, QCheckBox, QTextBrowser, QFrame,
     QScrollArea, QApplication, QTextEdit, QSplitter, QGridLayout
 )
-from PySide6.QtCore import Qt, QSettings, QTimer
+from PySide6.QtCore import Qt, QSettings, QTimer, Signal
 from PySide6.QtGui import QIcon, QShortcut, QKeySequence, QFont, QPixmap
 
 from ..widgets.feedback_text_edit import FeedbackTextEdit
@@ -30,6 +32,68 @@ from ..utils.performance import global_performance_monitor, global_response_trac
 from ..utils.responsive import ScreenSizeManager, responsive_manager
 from ..resources.icon_manager import icon_manager
 
+def _info_label_style(accent: str, background: str, min_width: int, max_width: Optional[int] = None) -> str:
+    """右侧信息行标签样式"""
+    max_width_rule = f"max-width: {max_width}px;" if max_width else ""
+    return f"""
+                color: {accent}; 
+                font-size: 10px; 
+                font-weight: bold;
+                background-color: {background};
+                padding: 2px 4px;
+                border-radius: 3px;
+                min-width: {min_width}px;
+                {max_width_rule}
+            """
+
+
+def _info_value_style(accent: str) -> str:
+    """右侧信息行取值样式"""
+    return f"""
+                color: #FFFFFF; 
+                font-size: 11px; 
+                font-weight: 500;
+                background-color: rgba(255, 255, 255, 0.05);
+                padding: 2px 6px;
+                border-radius: 3px;
+                border-left: 2px solid {accent};
+            """
+
+
+def _truncate_preview(text: str, limit: int) -> str:
+    """截断过长的展示文本，只在超出上限时切片"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# 信息行样式在模块加载时生成一次，各分区、各行共享同一字符串
+_PROJECT_LABEL_STYLE = _info_label_style('#81C784', 'rgba(129, 199, 132, 0.1)', 40, 50)
+_PROJECT_VALUE_STYLE = _info_value_style('#81C784')
+_GIT_LABEL_STYLE = _info_label_style('#64B5F6', 'rgba(100, 181, 246, 0.1)', 40)
+_GIT_VALUE_STYLE = _info_value_style('#64B5F6')
+_ACTIVITY_LABEL_STYLE = _info_label_style('#FFB74D', 'rgba(255, 183, 77, 0.1)', 50, 60)
+_ACTIVITY_VALUE_STYLE = _info_value_style('#FFB74D')
+
+
+# 常见的项目标识文件
+_PROJECT_INDICATORS = (
+    '.git', 'package.json', 'requirements.txt', 'pyproject.toml',
+    'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
+    '.gitignore', 'README.md', 'README.rst'
+)
+
+# 统计项目活动时跳过的目录
+_SKIPPED_WALK_DIRS = frozenset({'__pycache__', 'node_modules', '.venv'})
+
+# Ctrl+T 主题切换顺序
+_THEME_CYCLE = (
+    ThemeType.ENHANCED_GLASSMORPHISM,
+    ThemeType.MODERN_GLASSMORPHISM,
+    ThemeType.GLASSMORPHISM,
+    ThemeType.DARK,
+    ThemeType.HIGH_CONTRAST
+)
+
+
 class FeedbackResult(TypedDict):
     interactive_feedback: str
     images: List[str]
@@ -37,11 +101,15 @@ class FeedbackResult(TypedDict):
 class ThreeColumnFeedbackUI(QMainWindow):
     """三栏式交互反馈主窗口"""
     
+    # 后台线程收集到的项目活动信息（排队送回界面线程填充标签）
+    project_activity_ready = Signal(list)
+    
     def __init__(self, prompt: str, predefined_options: Optional[List[str]] = None):
         super().__init__()
         self.prompt = prompt
         self.predefined_options = predefined_options or []
         self.feedback_result = None
+        self._activity_loaded = False
         
         # 初始化文本处理器
         self.text_processor = TextProcessor()
@@ -54,16 +122,23 @@ class ThreeColumnFeedbackUI(QMainWindow):
         self.config_manager = global_config_manager
         self.data_visualization = None  # 按需创建
         
-        # 性能监控
-        global_performance_monitor.start_monitoring()
+        # 性能监控（遵循配置开关与采样间隔，关闭时不启动psutil轮询）
+        performance_config = self.config_manager.config.performance
+        if performance_config.enable_monitoring:
+            global_performance_monitor.start_monitoring(performance_config.monitoring_interval)
         start_time = time.time()
         
-        self._setup_window()
-        self._load_settings()
-        self._create_ui()
-        self._setup_shortcuts()
-        self._setup_config_integration()
-        self._apply_saved_config()
+        # 组装界面期间暂停重绘，布局和主题样式全部就绪后统一刷新一次
+        self.setUpdatesEnabled(False)
+        try:
+            self._setup_window()
+            self._load_settings()
+            self._create_ui()
+            self._setup_shortcuts()
+            self._setup_config_integration()
+            self._apply_saved_config()
+        finally:
+            self.setUpdatesEnabled(True)
         
         # 检查启动性能 (PRD要求: <2s)
         startup_time = time.time() - start_time
@@ -101,41 +176,15 @@ class ThreeColumnFeedbackUI(QMainWindow):
         """强制应用深色模式，防止系统主题覆盖"""
         try:
             from PySide6.QtWidgets import QApplication
-            from PySide6.QtGui import QPalette, QColor
+            from ..styles.dark_theme import DarkThemeStyles
             
             app = QApplication.instance()
             if app is None:
                 return
                 
-            print("🌙 在UI组件中强制启用深色模式")
-            
-            # 重新设置深色调色板
-            dark_palette = QPalette()
-            dark_palette.setColor(QPalette.Window, QColor(53, 53, 53))
-            dark_palette.setColor(QPalette.WindowText, QColor(255, 255, 255))
-            dark_palette.setColor(QPalette.Base, QColor(25, 25, 25))
-            dark_palette.setColor(QPalette.AlternateBase, QColor(53, 53, 53))
-            dark_palette.setColor(QPalette.ToolTipBase, QColor(0, 0, 0))
-            dark_palette.setColor(QPalette.ToolTipText, QColor(255, 255, 255))
-            dark_palette.setColor(QPalette.Text, QColor(255, 255, 255))
-            dark_palette.setColor(QPalette.Button, QColor(53, 53, 53))
-            dark_palette.setColor(QPalette.ButtonText, QColor(255, 255, 255))
-            dark_palette.setColor(QPalette.BrightText, QColor(255, 0, 0))
-            dark_palette.setColor(QPalette.Link, QColor(42, 130, 218))
-            dark_palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-            dark_palette.setColor(QPalette.HighlightedText, QColor(0, 0, 0))
-            
-            app.setPalette(dark_palette)
-            
-            # 验证深色模式状态
-            current_palette = app.palette()
-            window_color = current_palette.color(QPalette.Window)
-            is_dark = window_color.red() < 128
-            
-            if is_dark:
-                print("✅ UI组件深色模式验证通过")
-            else:
-                print("⚠️ UI组件深色模式验证失败，需要进一步调试")
+            # 启动入口已设置过时跳过，避免重复向所有控件广播调色板变化
+            if DarkThemeStyles.apply_forced_dark_palette(app):
+                print("🌙 在UI组件中强制启用深色模式")
                 
         except Exception as e:
             print(f"⚠️ UI组件深色模式设置异常: {e}")
@@ -146,7 +195,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
         self.line_height = self._load_line_height()
         
         # 设置窗口大小和位置 - 增加整体宽度
-        screen = QApplication.primaryScreen().geometry()
+        screen = ScreenSizeManager.primary_screen_geometry()
         window_height = min(1200, int(screen.height() * 0.85))  # 保持高度1200
         window_width = min(1600, int(screen.width() * 0.90))   # 增加宽度到1600
         
@@ -301,7 +350,9 @@ class ThreeColumnFeedbackUI(QMainWindow):
         self.custom_input.setPlaceholderText("输入自定义文本或反馈，支持粘贴图片/链接 | Shift+Enter换行，Enter发送")
         
         # 连接图片粘贴信号到中间栏预览
+        self._image_delete_handlers = {}  # 图片ID -> 移除对应预览的函数
         self.custom_input.image_pasted.connect(self._on_image_pasted)
+        self.custom_input.image_duplicate.connect(self._on_image_duplicate)
         
         # 🎯 连接输入法位置调整信号
         self.custom_input.ime_position_adjusted.connect(self._on_ime_position_adjusted)
@@ -410,7 +461,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
         # 添加到主布局
         layout.addWidget(self.images_container)
 
-    def _on_image_pasted(self, pixmap):
+    def _on_image_pasted(self, pixmap, image_id=None):
         """处理粘贴的图片，显示在中间栏预览区域"""
         # 确保图片容器可见
         if not self.images_container.isVisible():
@@ -453,30 +504,17 @@ class ThreeColumnFeedbackUI(QMainWindow):
         image_label.setMinimumSize(scaled_width, target_height)
         image_label.setMaximumSize(scaled_width, target_height)
         
-        # 缩放图片，保持宽高比
+        # 按物理像素缩放一次，再设置设备像素比，由Qt按逻辑尺寸绘制（高DPI与普通屏幕共用同一路径）
+        # 使用窗口所在屏幕的缩放比（Qt按窗口缓存，移动到其他屏幕时自动更新）
+        device_pixel_ratio = self.devicePixelRatioF()
         scaled_pixmap = pixmap.scaled(
-            scaled_width,
-            target_height,
+            round(scaled_width * device_pixel_ratio),
+            round(target_height * device_pixel_ratio),
             Qt.KeepAspectRatio,
             Qt.SmoothTransformation
         )
-        
-        # 支持高DPI屏幕
-        device_pixel_ratio = QApplication.primaryScreen().devicePixelRatio()
-        if device_pixel_ratio > 1.0:
-            hires_scaled_width = int(scaled_width * device_pixel_ratio)
-            hires_target_height = int(target_height * device_pixel_ratio)
-            
-            hires_pixmap = pixmap.scaled(
-                hires_scaled_width,
-                hires_target_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            hires_pixmap.setDevicePixelRatio(device_pixel_ratio)
-            image_label.setPixmap(hires_pixmap)
-        else:
-            image_label.setPixmap(scaled_pixmap)
+        scaled_pixmap.setDevicePixelRatio(device_pixel_ratio)
+        image_label.setPixmap(scaled_pixmap)
         
         # 删除按钮
         delete_button = QPushButton("×")
@@ -498,6 +536,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
         
         # 删除图片的功能
         def delete_image():
+            self._image_delete_handlers.pop(image_id, None)
             # 获取图片索引
             index = self.images_layout.indexOf(image_frame)
             if index >= 0:
@@ -507,10 +546,9 @@ class ThreeColumnFeedbackUI(QMainWindow):
                     widget.setParent(None)
                     widget.deleteLater()
                     
-                    # 从图片数据列表中删除（如果有的话）
-                    if hasattr(self, 'custom_input') and hasattr(self.custom_input, 'image_data'):
-                        if index < len(self.custom_input.image_data):
-                            del self.custom_input.image_data[index]
+                    # 从输入框的图片数据中删除，提交时不再包含该图片
+                    if image_id is not None:
+                        self.custom_input.remove_image(image_id)
                     
                     # 检查是否还有图片
                     has_images = False
@@ -525,6 +563,8 @@ class ThreeColumnFeedbackUI(QMainWindow):
                         self.images_container.setVisible(False)
         
         delete_button.clicked.connect(delete_image)
+        if image_id is not None:
+            self._image_delete_handlers[image_id] = delete_image
         
         # 将图片和删除按钮添加到布局
         frame_layout.addWidget(image_label, 0, 0)
@@ -549,7 +589,14 @@ class ThreeColumnFeedbackUI(QMainWindow):
             # 第一张图片，直接添加
             self.images_layout.addWidget(image_frame)
 
+    def _on_image_duplicate(self, image_id, existing_id):
+        """重复粘贴的图片已由输入框丢弃，同时移除其预览"""
+        delete_image = self._image_delete_handlers.get(image_id)
+        if delete_image is not None:
+            delete_image()
+
     # 🎯 输入法位置调整处理方法
+
     def _on_ime_position_adjusted(self, adjusted_rect):
         """处理输入法位置调整信号"""
         try:
@@ -610,15 +657,14 @@ class ThreeColumnFeedbackUI(QMainWindow):
                     project_type = "Git仓库"
                 else:
                     project_type = "普通文件夹"
-        except:
+        except OSError:
             project_type = "检测失败"
         
         # 计算项目大小（在正确的项目路径下）
         try:
-            import subprocess
             result = subprocess.run(['du', '-sh', project_path], capture_output=True, text=True, timeout=5)
             project_size = result.stdout.split()[0] if result.returncode == 0 else "未知"
-        except:
+        except (OSError, subprocess.SubprocessError, IndexError):
             project_size = "未知"
         
         # 实际项目信息
@@ -635,30 +681,13 @@ class ThreeColumnFeedbackUI(QMainWindow):
             
             # 🎨 增强label样式 - 更明显的视觉区分
             label_widget = QLabel(label)
-            label_widget.setStyleSheet("""
-                color: #81C784; 
-                font-size: 10px; 
-                font-weight: bold;
-                background-color: rgba(129, 199, 132, 0.1);
-                padding: 2px 4px;
-                border-radius: 3px;
-                min-width: 40px;
-                max-width: 50px;
-            """)
+            label_widget.setStyleSheet(_PROJECT_LABEL_STYLE)
             label_widget.setFixedWidth(50)
             label_widget.setAlignment(Qt.AlignCenter)
             
             # 🎯 增强value样式 - 清晰的内容显示
             value_widget = QLabel(value)
-            value_widget.setStyleSheet("""
-                color: #FFFFFF; 
-                font-size: 11px; 
-                font-weight: 500;
-                background-color: rgba(255, 255, 255, 0.05);
-                padding: 2px 6px;
-                border-radius: 3px;
-                border-left: 2px solid #81C784;
-            """)
+            value_widget.setStyleSheet(_PROJECT_VALUE_STYLE)
             value_widget.setWordWrap(True)
             
             row.addWidget(label_widget)
@@ -696,34 +725,35 @@ class ThreeColumnFeedbackUI(QMainWindow):
         project_dir = git_data.get("project_dir", ".")
         data_source = git_data.get("data_source", "local_query")
         
+        # git log按UTF-8输出作者名等信息，不能按系统区域编码（如Windows上的GBK）解码
         try:
             if data_source == "mcp_server":
                 # 如果是从MCP服务器获取的数据，尝试补充本地查询
                 untracked_result = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'], 
-                                                cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                                cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 untracked_count = len(untracked_result.stdout.strip().split('\n')) if untracked_result.stdout.strip() else 0
                 
                 author_result = subprocess.run(['git', 'log', '-1', '--pretty=format:%an'], 
-                                             cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                             cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 author = author_result.stdout.strip() if author_result.returncode == 0 else "MCP数据"
                 
                 time_result = subprocess.run(['git', 'log', '-1', '--pretty=format:%ar'], 
-                                           cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                           cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 commit_time = time_result.stdout.strip() if time_result.returncode == 0 else "MCP数据"
             else:
                 # 本地查询
                 untracked_result = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'], 
-                                                cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                                cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 untracked_count = len(untracked_result.stdout.strip().split('\n')) if untracked_result.stdout.strip() else 0
                 
                 author_result = subprocess.run(['git', 'log', '-1', '--pretty=format:%an'], 
-                                             cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                             cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 author = author_result.stdout.strip() if author_result.returncode == 0 else "未知"
                 
                 time_result = subprocess.run(['git', 'log', '-1', '--pretty=format:%ar'], 
-                                           cwd=project_dir, capture_output=True, text=True, timeout=5)
+                                           cwd=project_dir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=5)
                 commit_time = time_result.stdout.strip() if time_result.returncode == 0 else "未知"
-        except:
+        except (OSError, ValueError, subprocess.SubprocessError):
             untracked_count = 0
             author = "查询失败"
             commit_time = "查询失败"
@@ -733,7 +763,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
             ("分支:", git_data.get("branch", "未知")),
             ("修改文件:", f"{git_data.get('modified_files', 0)}个"),
             ("未跟踪:", f"{untracked_count}个"),
-            ("最后提交:", git_data.get("last_commit", "无提交")[:50] + "..." if len(git_data.get("last_commit", "")) > 50 else git_data.get("last_commit", "无提交")),
+            ("最后提交:", _truncate_preview(git_data.get("last_commit") or "无提交", 50)),
             ("作者:", author),
             ("时间:", commit_time)
         ]
@@ -743,30 +773,14 @@ class ThreeColumnFeedbackUI(QMainWindow):
             
             # 🎨 增强label样式 - Git信息专用配色
             label_widget = QLabel(label)
-            label_widget.setStyleSheet("""
-                color: #64B5F6; 
-                font-size: 10px; 
-                font-weight: bold;
-                background-color: rgba(100, 181, 246, 0.1);
-                padding: 2px 4px;
-                border-radius: 3px;
-                min-width: 40px;
-            """)
+            label_widget.setStyleSheet(_GIT_LABEL_STYLE)
             if isinstance(row_layout, QHBoxLayout):
                 label_widget.setFixedWidth(50)
                 label_widget.setAlignment(Qt.AlignCenter)
             
             # 🎯 增强value样式 - Git信息专用样式
             value_widget = QLabel(value)
-            value_widget.setStyleSheet("""
-                color: #FFFFFF; 
-                font-size: 11px; 
-                font-weight: 500;
-                background-color: rgba(255, 255, 255, 0.05);
-                padding: 2px 6px;
-                border-radius: 3px;
-                border-left: 2px solid #64B5F6;
-            """)
+            value_widget.setStyleSheet(_GIT_VALUE_STYLE)
             if label == "最后提交:":
                 value_widget.setWordWrap(True)
                 value_widget.setMaximumHeight(40)
@@ -795,14 +809,63 @@ class ThreeColumnFeedbackUI(QMainWindow):
         activity_layout = QVBoxLayout(activity_frame)
         activity_layout.setSpacing(5)
         
-        # 获取实际项目活动信息
+        # 项目活动统计需要遍历目录并调用find，推迟到窗口首次显示后再填充
+        self._activity_value_labels = []
+        activity_labels = ("最近修改:", "大文件:", "主要语言:", "文件类型:", "总文件数:")
+        
+        for label in activity_labels:
+            row = QHBoxLayout()
+            
+            # 🎨 增强label样式 - 活动信息专用配色
+            label_widget = QLabel(label)
+            label_widget.setStyleSheet(_ACTIVITY_LABEL_STYLE)
+            label_widget.setFixedWidth(60)
+            label_widget.setAlignment(Qt.AlignCenter)
+            
+            # 🎯 增强value样式 - 活动信息专用样式
+            value_widget = QLabel("统计中...")
+            value_widget.setStyleSheet(_ACTIVITY_VALUE_STYLE)
+            value_widget.setWordWrap(True)
+            self._activity_value_labels.append(value_widget)
+            
+            row.addWidget(label_widget)
+            row.addWidget(value_widget)
+            activity_layout.addLayout(row)
+        
+        layout.addWidget(activity_frame)
+
+    def showEvent(self, event):
+        """窗口首次显示后在后台线程加载项目活动统计，遍历大项目时不阻塞界面和输入"""
+        super().showEvent(event)
+        if not self._activity_loaded:
+            self._activity_loaded = True
+            self.project_activity_ready.connect(self._apply_project_activity)
+            thread = threading.Thread(target=self._load_project_activity, name="project-activity", daemon=True)
+            thread.start()
+
+    def _load_project_activity(self):
+        """在后台线程收集项目活动信息，通过信号交给界面线程"""
+        activity = self._collect_project_activity()
+        try:
+            self.project_activity_ready.emit(activity)
+        except RuntimeError:
+            # 收集完成前窗口已被销毁
+            pass
+
+    def _apply_project_activity(self, activity):
+        """在界面线程中填充项目活动占位标签"""
+        for value_widget, value in zip(self._activity_value_labels, activity):
+            value_widget.setText(value)
+
+    def _collect_project_activity(self) -> List[str]:
+        """获取实际项目活动信息"""
         try:
             # 统计文件类型
             file_types = {}
             large_files = 0
             for root, dirs, files in os.walk('.'):
                 # 跳过隐藏目录和常见的非重要目录
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'node_modules', '.venv']]
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in _SKIPPED_WALK_DIRS]
                 for file in files:
                     if not file.startswith('.'):
                         ext = os.path.splitext(file)[1].lower() or 'no_ext'
@@ -813,7 +876,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                             file_path = os.path.join(root, file)
                             if os.path.getsize(file_path) > 100 * 1024:  # >100KB
                                 large_files += 1
-                        except:
+                        except OSError:
                             pass
             
             # 获取主要文件类型
@@ -825,7 +888,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                 recent_result = subprocess.run(['find', '.', '-type', 'f', '-mtime', '-1', '!', '-path', './.git/*'], 
                                              capture_output=True, text=True, timeout=5)
                 recent_files = len(recent_result.stdout.strip().split('\n')) if recent_result.stdout.strip() else 0
-            except:
+            except (OSError, subprocess.SubprocessError):
                 recent_files = 0
             
             # 检测主要语言
@@ -847,53 +910,14 @@ class ThreeColumnFeedbackUI(QMainWindow):
             main_language = "未知"
             print(f"项目活动信息收集错误: {e}")
         
-        # 实际活动信息
-        activity_info = [
-            ("最近修改:", f"{recent_files}个文件 (24小时内)"),
-            ("大文件:", f"{large_files}个 (>100KB)"),
-            ("主要语言:", main_language),
-            ("文件类型:", file_types_str),
-            ("总文件数:", str(self.project_info.get("files", 0)))
+        # 实际活动信息（顺序与界面中的标签一致）
+        return [
+            f"{recent_files}个文件 (24小时内)",
+            f"{large_files}个 (>100KB)",
+            main_language,
+            file_types_str,
+            str(self.project_info.get("files", 0))
         ]
-        
-        for label, value in activity_info:
-            row = QHBoxLayout()
-            
-            # 🎨 增强label样式 - 活动信息专用配色
-            label_widget = QLabel(label)
-            label_widget.setStyleSheet("""
-                color: #FFB74D; 
-                font-size: 10px; 
-                font-weight: bold;
-                background-color: rgba(255, 183, 77, 0.1);
-                padding: 2px 4px;
-                border-radius: 3px;
-                min-width: 50px;
-                max-width: 60px;
-            """)
-            label_widget.setFixedWidth(60)
-            label_widget.setAlignment(Qt.AlignCenter)
-            
-            # 🎯 增强value样式 - 活动信息专用样式
-            value_widget = QLabel(value)
-            value_widget.setStyleSheet("""
-                color: #FFFFFF; 
-                font-size: 11px; 
-                font-weight: 500;
-                background-color: rgba(255, 255, 255, 0.05);
-                padding: 2px 6px;
-                border-radius: 3px;
-                border-left: 2px solid #FFB74D;
-            """)
-            value_widget.setWordWrap(True)
-            
-            row.addWidget(label_widget)
-            row.addWidget(value_widget)
-            activity_layout.addLayout(row)
-        
-        layout.addWidget(activity_frame)
-
-
 
     def _get_layout_improvements(self):
         """获取布局改进建议"""
@@ -936,7 +960,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                 try:
                     file_count = len([f for f in os.listdir(caller_cwd) 
                                     if os.path.isfile(os.path.join(caller_cwd, f))])
-                except:
+                except OSError:
                     file_count = 0
                 
                 return {
@@ -962,7 +986,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                     "is_caller_project": cwd != os.getcwd(),
                     "is_detected": False
                 }
-        except:
+        except Exception:
             return {
                 "name": "unknown", 
                 "path": "unknown", 
@@ -994,7 +1018,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                         return project_dir
             
             return None
-        except:
+        except Exception:
             return None
     
     def _is_project_directory(self, path):
@@ -1002,14 +1026,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
         if not os.path.exists(path):
             return False
         
-        # 检查常见的项目标识文件
-        project_indicators = [
-            '.git', 'package.json', 'requirements.txt', 'pyproject.toml',
-            'Cargo.toml', 'go.mod', 'pom.xml', 'build.gradle',
-            '.gitignore', 'README.md', 'README.rst'
-        ]
-        
-        for indicator in project_indicators:
+        for indicator in _PROJECT_INDICATORS:
             if os.path.exists(os.path.join(path, indicator)):
                 return True
         
@@ -1017,7 +1034,8 @@ class ThreeColumnFeedbackUI(QMainWindow):
 
     def _get_caller_project_name(self):
         """获取调用方项目名称用于窗口标题"""
-        project_info = self._get_project_info()
+        # 复用__init__中已获取的项目信息，避免重复扫描目录和检测父进程
+        project_info = self.project_info
         project_name = project_info.get('name', 'unknown')
         is_caller = project_info.get('is_caller_project', False)
         
@@ -1076,8 +1094,8 @@ class ThreeColumnFeedbackUI(QMainWindow):
             caller_commit = os.environ.get('MCP_CALLER_GIT_LAST_COMMIT')
             caller_is_git = os.environ.get('MCP_CALLER_IS_GIT_REPO', 'false').lower() == 'true'
             
-            # 获取项目信息
-            project_info = self._get_project_info()
+            # 获取项目信息（复用__init__中的结果）
+            project_info = self.project_info
             project_dir = project_info.get('path', os.getcwd())
             is_caller_project = project_info.get('is_caller_project', False)
             
@@ -1109,7 +1127,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                             results[key] = result.stdout.strip()
                         else:
                             results[key] = ""
-                    except:
+                    except (OSError, subprocess.SubprocessError):
                         results[key] = ""
                 
                 # 处理结果
@@ -1127,7 +1145,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
                     "is_git_repo": branch != 'unknown',
                     "data_source": "local_query"
                 }
-        except:
+        except Exception:
             return {
                 "branch": "unknown", 
                 "modified_files": 0, 
@@ -1167,9 +1185,10 @@ class ThreeColumnFeedbackUI(QMainWindow):
     
     def _setup_config_integration(self):
         """设置配置管理集成"""
-        # 连接配置变更信号
-        self.config_manager.theme_changed.connect(self._on_theme_changed)
-        self.config_manager.config_changed.connect(self._on_config_changed)
+        # 连接配置变更信号（全局配置管理器跨窗口共享，使用UniqueConnection防止重复注册）
+        self.config_manager.theme_changed.connect(self._on_theme_changed, Qt.UniqueConnection)
+        self.config_manager.config_changed.connect(self._on_config_changed, Qt.UniqueConnection)
+        self._config_signals_connected = True
         
         # 添加配置相关的快捷键
         config_shortcuts = [
@@ -1235,13 +1254,7 @@ class ThreeColumnFeedbackUI(QMainWindow):
     def _toggle_theme(self):
         """切换主题 - 强制深色模式"""
         current_theme = self.config_manager.config.ui.theme
-        available_themes = [
-            ThemeType.ENHANCED_GLASSMORPHISM,
-            ThemeType.MODERN_GLASSMORPHISM,
-            ThemeType.GLASSMORPHISM,
-            ThemeType.DARK,
-            ThemeType.HIGH_CONTRAST
-        ]
+        available_themes = _THEME_CYCLE
         
         # 找到当前主题的索引
         current_index = 0
@@ -1408,17 +1421,16 @@ class ThreeColumnFeedbackUI(QMainWindow):
         
         feedback_text = self.custom_input.toPlainText().strip()
         print(f"📝 输入框内容: '{feedback_text}'")
-        selected_options = []
 
-        # 获取选中的预定义选项
-        if self.option_checkboxes:
-            for i, checkbox in enumerate(self.option_checkboxes):
-                if checkbox.isChecked():
-                    selected_options.append(self.predefined_options[i])
+        # 获取选中的预定义选项（复选框与选项文本按创建顺序一一对应）
+        selected_options = [
+            option for checkbox, option in zip(self.option_checkboxes, self.predefined_options)
+            if checkbox.isChecked()
+        ]
 
         # 获取图片数据
         image_data = self.custom_input.get_image_data()
-        images = [img['base64'] for img in image_data] if image_data else []
+        images = list(map(itemgetter('base64'), image_data))
 
         # 组合反馈内容
         combined_feedback = []
@@ -1461,6 +1473,11 @@ class ThreeColumnFeedbackUI(QMainWindow):
 
     def closeEvent(self, event):
         """关闭事件处理"""
+        # 断开与全局配置管理器的连接，已关闭的窗口不再响应主题/配置变更
+        if getattr(self, '_config_signals_connected', False):
+            self.config_manager.theme_changed.disconnect(self._on_theme_changed)
+            self.config_manager.config_changed.disconnect(self._on_config_changed)
+            self._config_signals_connected = False
         event.accept()
 
     def run(self) -> FeedbackResult:
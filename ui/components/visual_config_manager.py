@@ -6,8 +6,6 @@ Visual Configuration Manager for Interactive Feedback MCP
 可视化配置管理器 - 提供直观的设置界面
 """
 
-import os
-import sys
 from typing import Dict, Any, Optional, Callable
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
@@ -19,10 +17,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QTimer, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QColor, QFont, QPixmap, QPainter
 
-# 导入项目模块
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from styles.enhanced_theme_manager import get_theme_manager, ThemeType
-from utils.logging_system import get_logger
+# 导入项目模块（包内相对导入，避免同一模块以不同名称重复加载）
+from ..styles.enhanced_theme_manager import get_theme_manager, ThemeType
+from ..utils.logging_system import get_logger
 
 logger = get_logger('visual_config')
 
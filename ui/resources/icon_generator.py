@@ -149,7 +149,7 @@ def main():
     from PySide6.QtWidgets import QApplication
     import sys
     
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     
     generator = IconGenerator()
     generator.save_icons()
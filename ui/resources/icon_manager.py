@@ -15,9 +15,19 @@ class IconManager:
     def __init__(self):
         self.icons_dir = os.path.join(os.path.dirname(__file__), "icons")
         self._icon_cache = {}
+        self._icon_info_cache = None  # (目录mtime, 图标信息)
         
     def get_app_icon(self, size: Optional[int] = None) -> QIcon:
-        """获取应用主图标"""
+        """获取应用主图标（同一尺寸只构建一次，应用与窗口共享同一个QIcon）"""
+        cache_key = ("app_icon", size)
+        icon = self._icon_cache.get(cache_key)
+        if icon is None:
+            icon = self._load_app_icon(size)
+            self._icon_cache[cache_key] = icon
+        return icon
+    
+    def _load_app_icon(self, size: Optional[int]) -> QIcon:
+        """从图标文件构建应用图标"""
         if size is None:
             # 返回多尺寸图标
             icon = QIcon()
@@ -68,26 +78,36 @@ class IconManager:
         main_icon_path = os.path.join(self.icons_dir, "app_icon.png")
         return os.path.exists(main_icon_path)
     
-    def get_icon_info(self) -> dict:
-        """获取图标信息"""
-        info = {
-            "icons_dir": self.icons_dir,
-            "available": self.is_available(),
-            "files": []
-        }
+    def get_icon_info(self, use_cache: bool = True) -> dict:
+        """获取图标信息（按图标目录修改时间缓存，目录未变化时不重复扫描）"""
+        try:
+            dir_mtime = os.stat(self.icons_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
         
-        if os.path.exists(self.icons_dir):
-            for file in os.listdir(self.icons_dir):
-                if file.endswith('.png'):
-                    file_path = os.path.join(self.icons_dir, file)
-                    file_size = os.path.getsize(file_path)
-                    info["files"].append({
-                        "name": file,
-                        "size": file_size,
-                        "path": file_path
-                    })
+        if use_cache and self._icon_info_cache is not None and self._icon_info_cache[0] == dir_mtime:
+            info = self._icon_info_cache[1]
+        else:
+            info = {
+                "icons_dir": self.icons_dir,
+                "available": self.is_available(),
+                "files": []
+            }
+            
+            if dir_mtime is not None:
+                with os.scandir(self.icons_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.png'):
+                            info["files"].append({
+                                "name": entry.name,
+                                "size": entry.stat().st_size,
+                                "path": entry.path
+                            })
+            
+            self._icon_info_cache = (dir_mtime, info)
         
-        return info
+        # 返回副本，避免调用方修改缓存内容
+        return {**info, "files": [dict(item) for item in info["files"]]}
 
 # 全局图标管理器实例
 icon_manager = IconManager() 
\ No newline at end of file
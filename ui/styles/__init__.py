@@ -1,7 +1,12 @@
 # Styles Module
-# 样式模块
+# 样式模块（按需加载）
 
-from .glassmorphism import GlassmorphismStyles
-from .dark_theme import DarkThemeStyles
+from ..utils.lazy import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    'GlassmorphismStyles': '.glassmorphism',
+    'DarkThemeStyles': '.dark_theme',
+})
+
+__all__ = ['GlassmorphismStyles', 'DarkThemeStyles']
 
-__all__ = ['GlassmorphismStyles', 'DarkThemeStyles'] 
\ No newline at end of file
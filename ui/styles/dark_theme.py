@@ -4,10 +4,52 @@
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QPalette, QColor
 from PySide6.QtCore import Qt
+from functools import lru_cache
+
+# 强制深色模式调色板：(角色, R, G, B)，启动入口与三栏界面共用
+_FORCED_DARK_ROLE_COLORS = (
+    (QPalette.Window, 53, 53, 53),
+    (QPalette.WindowText, 255, 255, 255),
+    (QPalette.Base, 25, 25, 25),
+    (QPalette.AlternateBase, 53, 53, 53),
+    (QPalette.ToolTipBase, 0, 0, 0),
+    (QPalette.ToolTipText, 255, 255, 255),
+    (QPalette.Text, 255, 255, 255),
+    (QPalette.Button, 53, 53, 53),
+    (QPalette.ButtonText, 255, 255, 255),
+    (QPalette.BrightText, 255, 0, 0),
+    (QPalette.Link, 42, 130, 218),
+    (QPalette.Highlight, 42, 130, 218),
+    (QPalette.HighlightedText, 0, 0, 0),
+)
+
+# QApplication上标记深色调色板已应用的动态属性
+_DARK_PALETTE_APPLIED_PROPERTY = "_ifb_dark_applied"
+
+@lru_cache(maxsize=1)
+def _build_forced_dark_palette() -> QPalette:
+    palette = QPalette()
+    for role, red, green, blue in _FORCED_DARK_ROLE_COLORS:
+        palette.setColor(role, QColor(red, green, blue))
+    return palette
 
 class DarkThemeStyles:
     """深色主题样式类"""
     
+    @staticmethod
+    def get_forced_dark_palette() -> QPalette:
+        """获取强制深色模式调色板（进程内只构建一次，返回隐式共享的副本）"""
+        return QPalette(_build_forced_dark_palette())
+    
+    @staticmethod
+    def apply_forced_dark_palette(app: QApplication) -> bool:
+        """为应用设置强制深色调色板；已设置过时跳过，避免再次向所有控件广播调色板变化"""
+        if app.property(_DARK_PALETTE_APPLIED_PROPERTY):
+            return False
+        app.setPalette(DarkThemeStyles.get_forced_dark_palette())
+        app.setProperty(_DARK_PALETTE_APPLIED_PROPERTY, True)
+        return True
+    
     @staticmethod
     def get_dark_mode_palette(app: QApplication):
         """获取深色模式调色板"""
@@ -231,7 +231,7 @@ class EnhancedGlassmorphismTheme:
     def get_text_edit_style(cls):
         """文本编辑器样式 - 焦点发光效果"""
         return f"""
-        QTextEdit {{
+        QTextEdit, QPlainTextEdit {{
             background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                 stop:0 rgba(0, 0, 0, 0.35),
                 stop:1 rgba(0, 0, 0, 0.25));
@@ -244,7 +244,7 @@ class EnhancedGlassmorphismTheme:
             selection-background-color: rgba(33, 150, 243, 0.3);
         }}
         
-        QTextEdit:focus {{
+        QTextEdit:focus, QPlainTextEdit:focus {{
             border: 2px solid {cls.COLORS['primary']};
             background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                 stop:0 rgba(0, 0, 0, 0.4),
@@ -252,7 +252,7 @@ class EnhancedGlassmorphismTheme:
             box-shadow: 0 0 20px rgba(33, 150, 243, 0.3);
         }}
         
-        QTextEdit:hover {{
+        QTextEdit:hover, QPlainTextEdit:hover {{
             border: 1px solid {cls.COLORS['border_primary']};
         }}
         """
@@ -9,9 +9,10 @@ Enhanced Theme Manager for Interactive Feedback MCP
 from enum import Enum
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
-import json
 from pathlib import Path
 
+from ..utils.json_io import read_json, write_json
+
 class ThemeType(Enum):
     """主题类型枚举"""
     ENHANCED_GLASSMORPHISM = "enhanced_glassmorphism"
@@ -278,7 +279,7 @@ class EnhancedThemeManager:
             background: {theme.colors.accent};
         }}
         
-        QTextEdit, QTextBrowser {{
+        QTextEdit, QPlainTextEdit, QTextBrowser {{
             background: rgba(0, 0, 0, 0.3);
             color: {theme.colors.text_primary};
             border: 1px solid rgba(255, 255, 255, 0.2);
@@ -390,8 +391,7 @@ class EnhancedThemeManager:
                 'animation_duration': theme.animation_duration
             }
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(theme_data, f, indent=2, ensure_ascii=False)
+            write_json(file_path, theme_data)
             
             return True
         except Exception:
@@ -400,8 +400,7 @@ class EnhancedThemeManager:
     def import_theme(self, file_path: str) -> Optional[ThemeType]:
         """导入主题配置"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                theme_data = json.load(f)
+            theme_data = read_json(file_path)
             
             colors = ColorScheme(**theme_data['colors'])
             
@@ -426,14 +425,13 @@ class EnhancedThemeManager:
             config_file = config_dir / 'theme_preferences.json'
             
             if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    prefs = json.load(f)
-                    theme_name = prefs.get('current_theme')
-                    if theme_name:
-                        for theme_type in ThemeType:
-                            if theme_type.value == theme_name:
-                                self.current_theme = theme_type
-                                break
+                prefs = read_json(config_file)
+                theme_name = prefs.get('current_theme')
+                if theme_name:
+                    for theme_type in ThemeType:
+                        if theme_type.value == theme_name:
+                            self.current_theme = theme_type
+                            break
         except Exception:
             pass  # 使用默认主题
     
@@ -449,8 +447,7 @@ class EnhancedThemeManager:
                 'last_updated': str(Path(__file__).stat().st_mtime)
             }
             
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(prefs, f, indent=2, ensure_ascii=False)
+            write_json(config_file, prefs)
         except Exception:
             pass  # 静默失败
     
@@ -1,6 +1,8 @@
 # Glassmorphism Styles for Interactive Feedback MCP
 # 毛玻璃样式定义
 
+from functools import lru_cache
+
 class GlassmorphismStyles:
     """毛玻璃效果样式类"""
     
@@ -29,6 +31,7 @@ class GlassmorphismStyles:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def text_browser():
         """文本浏览器毛玻璃样式 - 提高亮度"""
         return """
@@ -48,10 +51,11 @@ class GlassmorphismStyles:
         """ + GlassmorphismStyles._scrollbar_vertical()
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def text_edit():
         """文本编辑器毛玻璃样式"""
         return """
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 background: rgba(255, 255, 255, 0.08);
                 border: 1px solid rgba(255, 255, 255, 0.15);
                 border-radius: 12px;
@@ -60,7 +64,7 @@ class GlassmorphismStyles:
                 color: #e0e0e0;
                 selection-background-color: rgba(33, 150, 243, 0.6);
             }
-            QTextEdit:focus {
+            QTextEdit:focus, QPlainTextEdit:focus {
                 border: 2px solid rgba(33, 150, 243, 0.8);
                 background: rgba(255, 255, 255, 0.12);
             }
@@ -197,6 +201,7 @@ class GlassmorphismStyles:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def scroll_area():
         """滚动区域毛玻璃样式"""
         return """
@@ -150,7 +150,7 @@ class ModernGlassmorphismTheme:
     def get_text_edit_style():
         """获取文本编辑器样式"""
         return f"""
-            QTextEdit {{
+            QTextEdit, QPlainTextEdit {{
                 border: 2px solid {ModernGlassmorphismTheme.COLORS['border']};
                 border-radius: 12px;
                 padding: 15px;
@@ -161,7 +161,7 @@ class ModernGlassmorphismTheme:
                 selection-background-color: rgba(0, 212, 255, 0.3);
             }}
             
-            QTextEdit:focus {{
+            QTextEdit:focus, QPlainTextEdit:focus {{
                 border-color: {ModernGlassmorphismTheme.COLORS['primary']};
                 background: rgba(255, 255, 255, 0.12);
                 box-shadow: 0 0 15px rgba(0, 212, 255, 0.2);
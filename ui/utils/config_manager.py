@@ -3,14 +3,16 @@ Configuration Management System for Interactive Feedback MCP
 配置管理系统 - 支持配置导入导出、主题切换、用户偏好设置
 """
 
-import json
 import os
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from enum import Enum
 from PySide6.QtCore import QSettings, QObject, Signal
 from PySide6.QtWidgets import QApplication
 
+from .json_io import read_json, write_json
+
 class ThemeType(Enum):
     """主题类型枚举 - 强制深色模式"""
     GLASSMORPHISM = "glassmorphism"
@@ -112,9 +114,8 @@ class ConfigManager(QObject):
         try:
             # 首先尝试从JSON文件加载
             if os.path.exists(self.config_file_path):
-                with open(self.config_file_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    self._apply_config_data(config_data)
+                config_data = read_json(self.config_file_path)
+                self._apply_config_data(config_data)
             else:
                 # 从QSettings加载（向后兼容）
                 self._load_from_qsettings()
@@ -168,9 +169,7 @@ class ConfigManager(QObject):
             self.config.last_updated = datetime.datetime.now().isoformat()
             
             # 保存到JSON文件
-            config_data = asdict(self.config)
-            with open(self.config_file_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            write_json(self.config_file_path, asdict(self.config))
             
             # 同时保存到QSettings（向后兼容）
             self._save_to_qsettings()
@@ -198,9 +197,7 @@ class ConfigManager(QObject):
     def export_config(self, file_path: str) -> bool:
         """导出配置到文件"""
         try:
-            config_data = asdict(self.config)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            write_json(file_path, asdict(self.config))
             print(f"✅ 配置已导出到: {file_path}")
             return True
         except Exception as e:
@@ -214,8 +211,7 @@ class ConfigManager(QObject):
                 print(f"❌ 配置文件不存在: {file_path}")
                 return False
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = read_json(file_path)
             
             # 备份当前配置
             backup_path = self.config_file_path + ".backup"
@@ -361,8 +357,9 @@ class ThemeManager:
     """主题管理器"""
     
     @staticmethod
+    @lru_cache(maxsize=8)
     def get_theme_style(theme_type: ThemeType) -> str:
-        """根据主题类型获取样式 - 强制深色模式"""
+        """根据主题类型获取样式 - 强制深色模式（按主题缓存）"""
         if theme_type == ThemeType.ENHANCED_GLASSMORPHISM:
             from ..styles.enhanced_glassmorphism import EnhancedGlassmorphismTheme
             return EnhancedGlassmorphismTheme.get_main_window_style()
@@ -387,8 +384,10 @@ class ThemeManager:
     
     @staticmethod
     def apply_theme(widget, theme_type: ThemeType):
-        """应用主题到组件"""
+        """应用主题到组件（样式未变化时跳过，避免整棵控件树重新polish）"""
         style = ThemeManager.get_theme_style(theme_type)
+        if widget.styleSheet() == style:
+            return
         widget.setStyleSheet(style)
 
 # 全局配置管理器实例
@@ -0,0 +1,65 @@
+"""
+JSON File I/O Helpers for Interactive Feedback MCP
+JSON文件读写工具 - 整块读取/一次性写入，减少小块系统调用
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+PathLike = Union[str, Path]
+
+
+def dumps_bytes(data: Any, indent: int = 2) -> bytes:
+    """序列化为UTF-8字节串（中文不转义），优先使用orjson"""
+    if ORJSON_AVAILABLE and indent in (None, 2):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # orjson不支持的类型（如非字符串键）回退到标准库
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def loads_bytes(raw: bytes) -> Any:
+    """从UTF-8字节串反序列化，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def read_json(path: PathLike) -> Any:
+    """一次性读取整个文件再解析，避免 json.load 的逐块读取"""
+    return loads_bytes(Path(path).read_bytes())
+
+
+def write_json(path: PathLike, data: Any, indent: int = 2, atomic: bool = False) -> None:
+    """先完整序列化再单次写入文件
+
+    atomic为True时先写入同目录下的临时文件再替换目标文件，
+    其他进程同时读取时不会读到写了一半的内容。
+    """
+    raw = dumps_bytes(data, indent=indent)
+    path = Path(path)
+    if not atomic:
+        path.write_bytes(raw)
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(raw)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,22 @@
+# Lazy Package Exports for Interactive Feedback MCP
+# 包级别的按需导出（PEP 562 模块 __getattr__）
+
+import importlib
+import sys
+from typing import Callable, Dict
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], object]:
+    """生成包的 __getattr__：首次访问导出名时才导入对应子模块，并缓存到包的命名空间
+
+    exports 为 导出名 -> 相对模块路径（相对于 package）。
+    """
+    def __getattr__(name):
+        module_path = exports.get(name)
+        if module_path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_path, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -18,7 +18,6 @@ from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 import threading
 import time
-import traceback
 
 @dataclass
 class LogConfig:
@@ -117,12 +116,13 @@ class LoggerManager:
         """设置主日志文件处理器"""
         main_log_path = Path(self.config.log_dir) / self.config.log_filename
         
-        # 使用RotatingFileHandler实现日志轮转
+        # 使用RotatingFileHandler实现日志轮转（delay=True: 首次写入时才打开文件）
         handler = logging.handlers.RotatingFileHandler(
             main_log_path,
             maxBytes=self.config.max_file_size,
             backupCount=self.config.backup_count,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         handler.setFormatter(self.formatter)
         handler.setLevel(getattr(logging, self.config.level.upper()))
@@ -145,7 +145,8 @@ class LoggerManager:
             perf_log_path,
             maxBytes=self.config.max_file_size,
             backupCount=self.config.backup_count,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         
         # 性能日志使用特殊格式
@@ -166,7 +167,8 @@ class LoggerManager:
             error_log_path,
             maxBytes=self.config.max_file_size,
             backupCount=self.config.backup_count,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         
         # 错误日志使用详细格式
@@ -187,7 +189,8 @@ class LoggerManager:
             context_log_path,
             maxBytes=self.config.max_file_size,
             backupCount=self.config.backup_count,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         
         # 项目上下文日志使用JSON格式
@@ -264,6 +267,7 @@ class LoggerManager:
             error_msg += f" | Context: {json.dumps(context, ensure_ascii=False)}"
         
         if self.config.error_detail_enabled:
+            import traceback  # 仅在记录错误详情时加载
             error_msg += f" | Traceback: {traceback.format_exc()}"
         
         logger.error(error_msg)
@@ -314,7 +318,7 @@ class LoggerManager:
                         'size': stat.st_size,
                         'size_mb': stat.st_size / (1024 * 1024),
                         'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        'lines': sum(1 for _ in open(log_file, 'r', encoding='utf-8', errors='ignore'))
+                        'lines': _count_lines(log_file)
                     }
                 except Exception as e:
                     log_files[log_file.name] = {'error': str(e)}
@@ -353,7 +357,9 @@ class LoggerManager:
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
         
-        # 重新设置日志系统
+        # 重新设置日志系统（已禁用的处理器不再保留）
+        old_handlers = list(self.handlers.values())
+        self.handlers = {}
         self._setup_logging()
         
         # 重新配置现有的日志记录器
@@ -361,6 +367,10 @@ class LoggerManager:
             logger.handlers.clear()
             for handler in self.handlers.values():
                 logger.addHandler(handler)
+        
+        # 关闭被替换的处理器，释放其文件句柄
+        for handler in old_handlers:
+            handler.close()
 
 # 便利函数
 _manager = None
@@ -401,6 +411,17 @@ def log_project_context(context_type: str, context_data: Dict[str, Any]):
         _manager = LoggerManager()
     _manager.log_project_context(context_type, context_data)
 
+def _count_lines(path: Path, chunk_size: int = 1024 * 1024) -> int:
+    """按二进制块统计行数，无需逐行解码整个日志文件"""
+    count = 0
+    last_byte = b'\n'
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            count += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+    # 最后一行没有换行符时也计为一行
+    return count if last_byte == b'\n' else count + 1
+
 def get_log_summary() -> Dict[str, Any]:
     """获取日志摘要"""
     global _manager
@@ -1,9 +1,9 @@
 # Responsive Design Utilities
 # 响应式设计工具模块
 
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, QRect
 
 class ScreenSizeManager:
     """屏幕尺寸管理器 - 实现响应式设计"""
@@ -52,14 +52,38 @@ class ScreenSizeManager:
         }
     }
     
+    # 主屏幕几何尺寸缓存（主屏幕切换或分辨率变化时失效）
+    _primary_geometry: Optional[QRect] = None
+    _watched_screen = None
+    
+    @classmethod
+    def primary_screen_geometry(cls) -> Optional[QRect]:
+        """获取主屏幕几何尺寸（缓存结果，避免每次打开窗口都查询平台屏幕信息）"""
+        if cls._primary_geometry is None:
+            screen = QApplication.primaryScreen()
+            if not screen:
+                return None
+            if screen is not cls._watched_screen:
+                # 每个屏幕只连接一次信号；首次使用时同时监听主屏幕切换
+                if cls._watched_screen is None:
+                    QApplication.instance().primaryScreenChanged.connect(cls._invalidate_screen_geometry)
+                screen.geometryChanged.connect(cls._invalidate_screen_geometry)
+                cls._watched_screen = screen
+            cls._primary_geometry = screen.geometry()
+        return cls._primary_geometry
+    
+    @classmethod
+    def _invalidate_screen_geometry(cls, *_args):
+        """屏幕变化时清除缓存的几何尺寸"""
+        cls._primary_geometry = None
+    
     @classmethod
     def get_screen_category(cls) -> str:
         """获取当前屏幕分类"""
-        screen = QApplication.primaryScreen()
-        if not screen:
+        geometry = cls.primary_screen_geometry()
+        if geometry is None:
             return 'medium'
             
-        geometry = screen.geometry()
         width, height = geometry.width(), geometry.height()
         
         # 根据屏幕尺寸分类
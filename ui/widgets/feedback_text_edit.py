@@ -1,22 +1,53 @@
 # Custom Text Edit Widget for Interactive Feedback MCP
 # 自定义文本编辑器组件 - 输入法位置智能调整版
 
-import base64
-import uuid
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import hashlib
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-from PySide6.QtWidgets import QTextEdit, QApplication, QWidget
-from PySide6.QtCore import Qt, Signal, QBuffer, QIODevice, QRect, QPoint, QTimer, QByteArray
-from PySide6.QtGui import QKeyEvent, QPixmap, QInputMethodEvent, QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit, QApplication, QWidget, QToolTip
+from PySide6.QtCore import Qt, Signal, QBuffer, QIODevice, QRect, QPoint, QTimer, QByteArray, QSettings, QThreadPool
+from PySide6.QtGui import QKeyEvent, QPixmap, QImage, QImageWriter, QInputMethodEvent, QTextCursor
 
-class FeedbackTextEdit(QTextEdit):
+# 可选的SIMD加速Base64编码（未安装时回退到标准库）
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+def _b64encode_to_str(data: QByteArray) -> str:
+    """将QByteArray编码为Base64字符串，避免先复制成Python bytes"""
+    if PYBASE64_AVAILABLE:
+        # QByteArray支持缓冲区协议，pybase64可直接读取底层内存
+        return pybase64.b64encode_as_string(memoryview(data))
+    # 未安装pybase64时使用Qt Core内置的Base64编码
+    return data.toBase64().data().decode('ascii')
+
+PNG_SIGNATURE = QByteArray(b"\x89PNG\r\n\x1a\n")
+
+@lru_cache(maxsize=None)
+def _webp_writable() -> bool:
+    """Qt是否带有可写入WebP的图片插件（qtimageformats）"""
+    return b"webp" in (bytes(fmt) for fmt in QImageWriter.supportedImageFormats())
+
+class FeedbackTextEdit(QPlainTextEdit):
     """支持图片粘贴和输入法位置智能调整的自定义文本编辑器"""
     
     # 图片处理常量
     DEFAULT_MAX_IMAGE_WIDTH = 1624
     DEFAULT_MAX_IMAGE_HEIGHT = 1624
-    DEFAULT_IMAGE_FORMAT = "PNG"
+    DEFAULT_MAX_IMAGE_PIXELS = 2_000_000  # 超过该像素数时按比例缩小后再编码
+    DEFAULT_IMAGE_FORMAT = "PNG"         # 含透明通道的图片（没有WebP插件时）
+    LOSSLESS_IMAGE_FORMAT = "WEBP"       # 含透明通道的图片：无损WebP，界面截图体积远小于PNG
+    OPAQUE_IMAGE_FORMAT = "JPEG"         # 不透明截图，编码更快、体积更小
+    LOSSLESS_WEBP_QUALITY = 100          # Qt的WebP插件在质量为100时使用无损编码
+    DEFAULT_JPEG_QUALITY = 85
+    DEFAULT_PNG_QUALITY = 80             # Qt按 (100-质量)*9/91 换算zlib压缩级别：80对应级别1，编码快、体积略大
+    PREVIEW_MAX_HEIGHT = 160             # 预览图最大高度（预览区显示约70px，留出HiDPI余量）
     
     # 输入法位置调整常量 - 优化后的偏移量
     IME_OFFSET_Y = 15           # 输入法框向下偏移像素 (从25调整为15)
@@ -24,7 +55,8 @@ class FeedbackTextEdit(QTextEdit):
     IME_UPDATE_DELAY = 10       # 位置更新延迟(ms)
 
     # 定义类级别的信号
-    image_pasted = Signal(QPixmap)
+    image_pasted = Signal(QPixmap, str)  # 参数为预览用的缩略图（宽高比与原图一致）和图片ID
+    image_duplicate = Signal(str, str)  # 重复粘贴的图片ID、已存在的同内容图片ID（编码线程中检测，排队送回界面线程）
     ime_position_adjusted = Signal(QRect)  # 输入法位置调整信号
     submit_requested = Signal()  # 新增：提交请求信号
 
@@ -37,9 +69,29 @@ class FeedbackTextEdit(QTextEdit):
         self.original_cursor_rect = QRect()
         self.adjusted_ime_rect = QRect()
         
-        # 图片数据存储
-        self._images_list = []
+        # 图片数据存储（每张图片的Base64只保存一份）
         self._image_data = []
+        self._image_keys = {}  # 图片内容摘要 -> image_info，重复粘贴同一张图片时复用
+        self._image_lock = threading.Lock()  # 编码线程与界面线程都会读写 _image_data 和 _image_keys，统一由该锁保护
+        self._paste_seq = 0    # 进程内递增的图片序号，只用于标识图片
+        self._encode_pool = QThreadPool(self)
+        
+        # JPEG/PNG质量与尺寸上限可通过QSettings调整
+        # （ImageSettings/jpegQuality、ImageSettings/pngQuality、ImageSettings/maxWidth、ImageSettings/maxHeight、ImageSettings/maxPixels）
+        settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+        self.max_image_width = settings.value("ImageSettings/maxWidth", self.DEFAULT_MAX_IMAGE_WIDTH, type=int)
+        self.max_image_height = settings.value("ImageSettings/maxHeight", self.DEFAULT_MAX_IMAGE_HEIGHT, type=int)
+        self.jpeg_quality = settings.value("ImageSettings/jpegQuality", self.DEFAULT_JPEG_QUALITY, type=int)
+        self.png_quality = settings.value("ImageSettings/pngQuality", self.DEFAULT_PNG_QUALITY, type=int)
+        self.max_image_pixels = settings.value("ImageSettings/maxPixels", self.DEFAULT_MAX_IMAGE_PIXELS, type=int)
+        # ImageSettings/lossless 为True时不透明图片也使用无损格式（编码更慢、体积更大）
+        self.lossless_images = settings.value("ImageSettings/lossless", False, type=bool)
+        # 无损格式：有WebP插件时默认WebP，可通过 ImageSettings/losslessFormat 改回PNG
+        default_lossless_format = self.LOSSLESS_IMAGE_FORMAT if _webp_writable() else self.DEFAULT_IMAGE_FORMAT
+        self.lossless_image_format = settings.value("ImageSettings/losslessFormat", default_lossless_format, type=str)
+        
+        # 重复粘贴在编码线程中才能识别，回到界面线程后移除重复的图片并提示用户
+        self.image_duplicate.connect(self._on_image_duplicate)
         
         # 设置定时器用于延迟更新输入法位置
         self.ime_update_timer = QTimer()
@@ -234,94 +286,61 @@ class FeedbackTextEdit(QTextEdit):
         if source.hasImage():
             image = source.imageData()
             if image and not image.isNull():
-                pixmap = QPixmap.fromImage(image)
-                if not pixmap.isNull():
-                    # 存储图片数据
-                    image_id = str(uuid.uuid4())
-                    image_uri = self.get_image_data_uri(pixmap)
-                    image_info = {
-                        'id': image_id,
-                        'base64': image_uri.split(',')[1] if ',' in image_uri else image_uri,
-                        'width': pixmap.width(),
-                        'height': pixmap.height(),
-                        'timestamp': datetime.now().isoformat()
-                    }
+                # 存储图片数据（是否与已粘贴的图片重复由编码线程计算内容摘要后判断，大图哈希不阻塞界面）
+                self._paste_seq += 1
+                timestamp = time.time()
+                image_id = f"pasted_image_{self._paste_seq}_{int(timestamp)}"
+                # 直接编码剪贴板中的QImage，不创建原尺寸的QPixmap（避免一次整图像素复制）
+                # Base64字符串只保存一份，数据URI在需要时再拼接
+                image_info = {
+                    'id': image_id,
+                    'base64': None,
+                    'mime_type': None,
+                    'width': image.width(),
+                    'height': image.height(),
+                    'timestamp': timestamp
+                }
+                with self._image_lock:
                     self._image_data.append(image_info)
-                    self._images_list.append(image_uri)
-                    
-                    print(f"📷 图片已存储: {image_id}, 大小: {pixmap.width()}x{pixmap.height()}")
-                    self.image_pasted.emit(pixmap)
-                    return
+                
+                # 剪贴板中已有PNG数据时一并交给编码任务，可省去一次PNG重新编码
+                source_png = source.data("image/png") if source.hasFormat("image/png") else None
+                
+                # 去重、透明像素检测和编码都在线程池中进行，避免大截图粘贴时阻塞界面；读取图片数据前会等待编码完成
+                self._encode_pool.start(lambda: self._encode_pasted_image(image_info, image, source_png))
+                
+                print(f"📷 图片已存储: {image_id}, 大小: {image.width()}x{image.height()}")
+                self.image_pasted.emit(self._preview_pixmap(image), image_id)
+                return
         
         # 处理其他类型的粘贴内容
         super().insertFromMimeData(source)
 
     def keyPressEvent(self, event: QKeyEvent):
-        """处理按键事件"""
-        # 检查焦点状态
-        has_focus = self.hasFocus()
-        is_enabled = self.isEnabled()
-        is_visible = self.isVisible()
-        print(f"🔍 组件状态检查: Focus={has_focus}, Enabled={is_enabled}, Visible={is_visible}")
-        
-        # 详细的按键调试信息
-        key_name = event.text() if event.text() else f"Key_{event.key()}"
-        modifiers = []
-        
-        # 改进的修饰键检测，支持macOS
-        mod_flags = event.modifiers()
-        if mod_flags & Qt.ControlModifier:
-            modifiers.append("Ctrl")
-        if mod_flags & Qt.MetaModifier:  # macOS上的Cmd键
-            modifiers.append("Cmd")
-        if mod_flags & Qt.ShiftModifier:
-            modifiers.append("Shift")
-        if mod_flags & Qt.AltModifier:
-            modifiers.append("Alt")
-        
-        modifier_text = "+".join(modifiers) if modifiers else "None"
-        print(f"🎹 按键检测: Key={event.key()}, Text='{event.text()}', Modifiers={modifier_text}")
+        """处理按键事件（普通按键直接交给父类，只有Enter/Esc需要额外判断）"""
+        key = event.key()
         
         # 检测Enter/Return键
-        is_return_enter = event.key() in (Qt.Key_Return, Qt.Key_Enter)
-        
-        if is_return_enter:
-            # 检测修饰键状态
-            has_shift = bool(mod_flags & Qt.ShiftModifier)
-            has_ctrl_or_cmd = bool(mod_flags & (Qt.ControlModifier | Qt.MetaModifier))
+        if key == Qt.Key_Return or key == Qt.Key_Enter:
+            mod_flags = event.modifiers()
             
-            if has_shift:
+            if mod_flags & Qt.ShiftModifier:
                 # Shift+Enter: 换行（默认行为）
-                print("↩️ Shift+Enter检测 - 执行换行")
                 super().keyPressEvent(event)
                 return
-            elif has_ctrl_or_cmd:
-                # Ctrl+Enter 或 Cmd+Enter: 提交
+            
+            # Enter、Ctrl+Enter 或 Cmd+Enter: 提交 (three_column_layout的默认行为)
+            if mod_flags & (Qt.ControlModifier | Qt.MetaModifier):
                 cmd_key = "Cmd" if mod_flags & Qt.MetaModifier else "Ctrl"
                 print(f"⌨️ {cmd_key}+Enter快捷键触发提交 ✅")
-                self.submit_requested.emit()
-                event.accept()
-                return
             else:
-                # 单独的Enter: 提交 (three_column_layout的默认行为)
                 print("⌨️ Enter键触发提交 ✅")
-                print(f"📡 即将发射submit_requested信号...")
-                
-                # 发射信号 - 简化调试，避免API错误
-                try:
-                    self.submit_requested.emit()
-                    print(f"✅ submit_requested信号已发射！")
-                except Exception as e:
-                    print(f"❌ 信号发射失败: {e}")
-                    import traceback
-                    traceback.print_exc()
-                
-                print(f"🔗 信号发射操作完成")
-                event.accept()
-                return
+            self.submit_requested.emit()
+            event.accept()
+            return
         
         # 检测Esc键来取消输入法
-        if event.key() == Qt.Key_Escape and self.ime_active:
+        if key == Qt.Key_Escape and self.ime_active:
             self.ime_active = False
             self._reset_ime_position()
             print("⌨️ Esc键取消输入法")
@@ -331,42 +350,168 @@ class FeedbackTextEdit(QTextEdit):
         # 处理其他按键
         super().keyPressEvent(event)
 
-    def get_image_data_uri(self, pixmap: QPixmap, max_width: int = None, max_height: int = None, 
-                          image_format: str = None) -> str:
-        """将QPixmap转换为Base64数据URI"""
+    def get_image_data_uri(self, pixmap: Union[QPixmap, QImage], max_width: int = None, max_height: int = None, 
+                          image_format: str = None, has_alpha: Optional[bool] = None) -> str:
+        """将QPixmap或QImage转换为Base64数据URI（传入QImage时无需先转换为QPixmap）"""
+        mime_type, image_base64 = self._encode_image(pixmap, max_width, max_height, image_format, has_alpha)
+        return f"data:{mime_type};base64,{image_base64}"
+
+    def _encode_image(self, pixmap: Union[QPixmap, QImage], max_width: int = None, max_height: int = None,
+                      image_format: str = None, has_alpha: Optional[bool] = None,
+                      source_png: Optional[QByteArray] = None) -> Tuple[str, str]:
+        """缩放并编码图片，返回 (MIME类型, Base64字符串)
+        
+        未指定格式时，不透明图片使用JPEG编码，含透明通道的图片保留PNG。
+        source_png 为剪贴板中原始的PNG数据：输出同为PNG且无需缩放时直接使用，不再重新编码。
+        """
         if max_width is None:
-            max_width = self.DEFAULT_MAX_IMAGE_WIDTH
+            max_width = self.max_image_width
         if max_height is None:
-            max_height = self.DEFAULT_MAX_IMAGE_HEIGHT
+            max_height = self.max_image_height
         if image_format is None:
-            image_format = self.DEFAULT_IMAGE_FORMAT
+            if has_alpha is None:
+                has_alpha = pixmap.hasAlphaChannel()
+            image_format = self.lossless_image_format if has_alpha or self.lossless_images else self.OPAQUE_IMAGE_FORMAT
 
-        # 缩放图片
-        if pixmap.width() > max_width or pixmap.height() > max_height:
+        # 缩放图片：同时限制边长和总像素数，编码耗时与像素数成正比
+        pixel_count = pixmap.width() * pixmap.height()
+        if pixel_count > self.max_image_pixels > 0:
+            factor = math.sqrt(self.max_image_pixels / pixel_count)
+            max_width = min(max_width, int(pixmap.width() * factor))
+            max_height = min(max_height, int(pixmap.height() * factor))
+        needs_scaling = pixmap.width() > max_width or pixmap.height() > max_height
+        if needs_scaling:
             pixmap = pixmap.scaled(max_width, max_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        
+        format_key = image_format.upper()
+        if format_key == "PNG" and not needs_scaling and source_png is not None and source_png.startsWith(PNG_SIGNATURE):
+            return "image/png", _b64encode_to_str(source_png)
+        
+        # 不透明图片去掉Alpha通道再做无损编码：写入3通道RGB而不是RGBA，编码更快、体积更小
+        if (has_alpha is False and isinstance(pixmap, QImage) and pixmap.hasAlphaChannel()
+                and format_key in ("PNG", "WEBP")):
+            pixmap = pixmap.convertToFormat(QImage.Format_RGB32)
 
-        # 转换为字节数组
+        # 直接写入绑定的QByteArray，编码结果在Base64之前不经过Python bytes
         byte_array = QByteArray()
         buffer = QBuffer(byte_array)
         buffer.open(QIODevice.WriteOnly)
-        pixmap.save(buffer, image_format)
+        if format_key in ("JPEG", "JPG"):
+            quality = self.jpeg_quality
+        elif format_key == "WEBP":
+            quality = self.LOSSLESS_WEBP_QUALITY
+        elif format_key == "PNG":
+            quality = self.png_quality
+        else:
+            quality = -1
+        pixmap.save(buffer, image_format, quality)
+        buffer.close()
 
         # 编码为Base64
-        image_base64 = base64.b64encode(byte_array.data()).decode('utf-8')
+        image_base64 = _b64encode_to_str(byte_array)
         mime_type = f"image/{image_format.lower()}"
         
-        return f"data:{mime_type};base64,{image_base64}"
+        return mime_type, image_base64
+
+    @staticmethod
+    def _image_content_key(image: QImage) -> Tuple[int, int, int, bytes]:
+        """计算图片内容摘要（剪贴板每次返回新的QImage，cacheKey无法识别重复内容）"""
+        if image.colorCount() or image.depth() < 8:
+            # 索引色/单色图片的像素值依赖调色板且不足一字节，统一转换后再比较
+            image = image.convertToFormat(QImage.Format_ARGB32)
+        data = image.constBits()
+        row_bytes, stride = image.width() * image.depth() // 8, image.bytesPerLine()
+        hasher = hashlib.blake2b(digest_size=16)
+        if stride == row_bytes:
+            hasher.update(data)
+        else:
+            # 每行末尾的对齐填充字节内容不确定，只哈希每行的有效部分
+            for offset in range(0, image.height() * stride, stride):
+                hasher.update(data[offset:offset + row_bytes])
+        return image.width(), image.height(), int(image.format().value), hasher.digest()
+
+    @classmethod
+    def _preview_pixmap(cls, image: QImage) -> QPixmap:
+        """只为缩略图创建QPixmap，大图先在QImage上缩小再转换"""
+        if image.height() > cls.PREVIEW_MAX_HEIGHT:
+            image = image.scaledToHeight(cls.PREVIEW_MAX_HEIGHT, Qt.SmoothTransformation)
+        return QPixmap.fromImage(image)
+
+    @staticmethod
+    def _has_alpha_pixels(image: QImage) -> bool:
+        """检测图片是否含有实际的透明像素（剪贴板图片常为带Alpha的格式但全部不透明）"""
+        if not image.hasAlphaChannel():
+            return False
+        alpha = image.convertToFormat(QImage.Format_Alpha8)
+        data = alpha.constBits().tobytes()
+        width, stride = alpha.width(), alpha.bytesPerLine()
+        if stride == width:
+            return bool(data.strip(b'\xff'))
+        # 每行末尾有对齐填充字节，逐行检查有效部分
+        return any(data[offset:offset + width].strip(b'\xff') for offset in range(0, len(data), stride))
+
+    def _encode_pasted_image(self, image_info: Dict[str, Any], image: QImage, source_png: Optional[QByteArray] = None):
+        """在工作线程中编码粘贴的图片，结果直接写回image_info（只处理QImage，不访问界面对象）"""
+        try:
+            # 哈希在锁外计算；是否仍存在与登记内容摘要在同一次加锁中完成，避免与删除交错留下失效的摘要
+            content_key = self._image_content_key(image)
+            with self._image_lock:
+                # 排队期间已被删除的图片不再编码
+                if not any(info is image_info for info in self._image_data):
+                    return
+                existing = self._image_keys.get(content_key)
+                if existing is None:
+                    self._image_keys[content_key] = image_info
+            # 同一张图片重复粘贴时不再编码，交给界面线程移除并提示
+            if existing is not None:
+                self.image_duplicate.emit(image_info['id'], existing['id'])
+                return
+            
+            has_alpha = self._has_alpha_pixels(image)
+            image_info['mime_type'], image_info['base64'] = self._encode_image(
+                image, has_alpha=has_alpha, source_png=source_png)
+        except Exception as e:
+            print(f"❌ 图片编码失败: {image_info['id']}, {e}")
+
+    def _encoded_images(self) -> List[Dict[str, Any]]:
+        """等待后台编码完成，返回编码成功的图片"""
+        self._encode_pool.waitForDone()
+        with self._image_lock:
+            return [info for info in self._image_data if info['base64'] is not None]
 
     def get_image_data(self) -> List[Dict[str, Any]]:
         """获取当前存储的图片数据（与main_window兼容）"""
-        return self._image_data.copy()
+        return self._encoded_images()
 
     def get_images_list(self) -> List[str]:
-        """获取当前存储的图片列表"""
-        return self._images_list.copy()
+        """获取当前存储的图片列表（按需拼接数据URI）"""
+        return [f"data:{info['mime_type']};base64,{info['base64']}" for info in self._encoded_images()]
         
+    def remove_image(self, image_id: str) -> bool:
+        """删除一张粘贴的图片；尚未开始的编码会被跳过"""
+        with self._image_lock:
+            for index, info in enumerate(self._image_data):
+                if info['id'] == image_id:
+                    del self._image_data[index]
+                    self._image_keys = {key: value for key, value in self._image_keys.items() if value is not info}
+                    break
+            else:
+                return False
+        print(f"🗑️ 图片已删除: {image_id}")
+        return True
+
+    def _on_image_duplicate(self, image_id: str, existing_id: str):
+        """重复粘贴的图片不提交，并在光标处提示用户"""
+        if self.remove_image(image_id):
+            print(f"📷 图片已存在，跳过重复粘贴: {existing_id}")
+            QToolTip.showText(self.viewport().mapToGlobal(self.cursorRect().bottomLeft()),
+                              "该图片已粘贴过，未重复添加", self)
+
     def clear_images(self):
-        """清空图片存储"""
-        self._images_list.clear()
-        self._image_data.clear()
+        """清空图片存储（丢弃排队中的编码任务）"""
+        self._encode_pool.clear()
+        self._encode_pool.waitForDone()
+        with self._image_lock:
+            self._image_data.clear()
+            self._image_keys.clear()
         print("🗑️ 图片存储已清空") 
\ No newline at end of file